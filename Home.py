@@ -3,6 +3,8 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 from config.config import Config
+from src.analytics import load_analytics
+from src.dataset import load_dataset
 from utils.styling import load_css
 
 
@@ -26,22 +28,21 @@ Welcome to the Boston House Price Prediction App! This application helps you:
 Use the navigation menu on the left to explore different sections of the app.
 """)
 
-# Load and display sample data
-@st.cache_data
+# Summary numbers come from the precomputed analytics, sample rows from the memory-mapped columns
 def load_data():
-    return pd.read_csv(Config.DATA_PATH)
+    return load_analytics()
 
 try:
-    df = load_data()
+    analytics = load_data()
     
     # Show dataset overview
     st.header("📊 Dataset Overview")
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.metric("Number of Records", df.shape[0])
+        st.metric("Number of Records", analytics['rows'])
     with col2:
-        st.metric("Average House Price", f"${df['MEDV'].mean():,.2f}")
+        st.metric("Average House Price", f"${analytics['features'][Config.TARGET_COLUMN]['describe']['mean']:,.2f}")
     with col3:
         st.metric("Features Used", len(Config.FEATURE_COLUMNS))
     
@@ -56,7 +57,7 @@ try:
     
     # Show sample data
     st.header("🔍 Sample Data")
-    st.dataframe(df.head())
+    st.dataframe(load_dataset().head())
     
 except Exception as e:
     st.error(f"Error loading data: {str(e)}")
\ No newline at end of file
@@ -1,9 +1,22 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-import pickle
+import time
+# Started before the other imports, which are most of the startup cost
+_startup_begin = time.perf_counter()
+
+import threading
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Header, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel, ConfigDict, ValidationError
+from typing import Dict, List, Optional, Union
 import numpy as np
-import pandas as pd
 from config.config import Config
+from src.batcher import MicroBatcher
+from src.prediction_cache import PredictionCache
+from src.registry import ModelHolder
+from src.sweep import SweepError, sweep_grid
+from src.validation import validator
 from utils.logger import setup_logger
 
 logger = setup_logger('api')
@@ -17,9 +30,11 @@ class FeatureInput(BaseModel):
     TAX: float
     NOX: float
     B: float
-    
-    class Config:
-        schema_extra = {
+
+    # Strict: numbers only, no coercion of strings such as "6.0"
+    model_config = ConfigDict(
+        strict=True,
+        json_schema_extra={
             "example": {
                 "LSTAT": 10.0,
                 "RM": 6.0,
@@ -31,13 +46,117 @@ class FeatureInput(BaseModel):
                 "B": 300.0
             }
         }
+    )
+
+class BatchFeatureInput(BaseModel):
+    records: Optional[List[FeatureInput]] = None
+    columns: Optional[Dict[str, List[float]]] = None
+
+    model_config = ConfigDict(
+        strict=True,
+        json_schema_extra={
+            "example": {
+                "records": [
+                    {
+                        "LSTAT": 10.0,
+                        "RM": 6.0,
+                        "CRIM": 0.1,
+                        "PTRATIO": 15.0,
+                        "INDUS": 10.0,
+                        "TAX": 300.0,
+                        "NOX": 0.5,
+                        "B": 300.0
+                    }
+                ]
+            }
+        }
+    )
+
+class SweepInput(BaseModel):
+    base: FeatureInput
+    features: List[str]
+    points: Optional[int] = None
+
+    model_config = ConfigDict(
+        strict=True,
+        json_schema_extra={
+            "example": {
+                "base": FeatureInput.model_config["json_schema_extra"]["example"],
+                "features": ["RM", "LSTAT"],
+                "points": 50
+            }
+        }
+    )
+
+class PredictionResponse(BaseModel):
+    prediction: float
+
+class BatchPredictionResponse(BaseModel):
+    predictions: List[Optional[float]]
+    errors: List[Dict]
+
+class SweepResponse(BaseModel):
+    features: List[str]
+    axes: List[List[float]]
+    # A curve for one feature, a surface indexed [first feature][second feature] for two
+    predictions: Union[List[float], List[List[float]]]
+
+class ReloadRequest(BaseModel):
+    version: Optional[str] = None
+
+def parse_body(model, body):
+    """Validate a raw JSON body in one pass with pydantic-core, no intermediate dict"""
+    try:
+        return model.model_validate_json(body)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors(include_url=False))
+
+# Schemas of the parse_body models, merged into the OpenAPI components when the schema is built
+body_schemas = {}
+
+def json_body(model):
+    """OpenAPI entry for an endpoint that reads its body with parse_body"""
+    schema = model.model_json_schema(ref_template="#/components/schemas/{model}")
+    body_schemas.update(schema.pop("$defs", {}))
+    body_schemas[model.__name__] = schema
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": {"$ref": f"#/components/schemas/{model.__name__}"}}}
+        }
+    }
+
+model_holder = ModelHolder()
+prediction_cache = PredictionCache()
+micro_batcher = MicroBatcher() if Config.MICRO_BATCHING else None
+
+@asynccontextmanager
+async def lifespan(app):
+    # Watch the model registry and hot-swap newly published versions
+    model_holder.start_watcher()
+    # Import the native booster for large batches in the background, after startup
+    threading.Thread(target=model_holder.warm_up, daemon=True).start()
+    yield
+    model_holder.stop_watcher()
+    if micro_batcher is not None:
+        micro_batcher.close()
 
 app = FastAPI(
     title=Config.API_TITLE,
     description=Config.API_DESCRIPTION,
-    version=Config.API_VERSION
+    version=Config.API_VERSION,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
+def openapi():
+    if app.openapi_schema is None:
+        schema = FastAPI.openapi(app)
+        schema.setdefault("components", {}).setdefault("schemas", {}).update(body_schemas)
+    return app.openapi_schema
+
+app.openapi = openapi
+
 #--- Jika deploy dengan docker aktifkan Cors -----
 # app.add_middleware(
 #     CORSMiddleware,
@@ -49,44 +168,229 @@ app = FastAPI(
 
 # Load model and scaler at startup
 try:
-    with open(Config.MODEL_PATH, 'rb') as f:
-        model = pickle.load(f)
-    with open(Config.SCALER_PATH, 'rb') as f:
-        scaler = pickle.load(f)
-    logger.info("Model and scaler loaded successfully")
+    model_holder.load()
+    logger.info(f"API ready in {time.perf_counter() - _startup_begin:.3f}s from the start of the app import")
 except Exception as e:
     logger.error(f"Error loading model or scaler: {str(e)}")
     raise
 
-@app.post("/predict")
-async def predict(features: FeatureInput):
+@app.post("/predict", openapi_extra=json_body(FeatureInput), responses={200: {"model": PredictionResponse}})
+async def predict(request: Request):
+    features = parse_body(FeatureInput, await request.body())
     try:
         # Validate input
-        for feature, value in features.dict().items():
-            if not Config.is_valid_feature_value(feature, value):
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Invalid value for {feature}"
-                )
-        
-        # Prepare input
-        feature_dict = features.dict()
-        input_df = pd.DataFrame([feature_dict])[Config.FEATURE_COLUMNS]
-        
-        # Scale features
-        input_scaled = scaler.transform(input_df)
+        feature_dict = features.model_dump()
+        values = [feature_dict[feature] for feature in Config.FEATURE_COLUMNS]
+        invalid = validator.invalid_features(values)
+        if invalid:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid value for {invalid[0]}"
+            )
         
-        # Make prediction
-        prediction = model.predict(input_scaled)
-        final_prediction = float(np.exp(prediction[0]))
+        # Repeated inputs are served from the cache
+        version, predictor = model_holder.current
+        cache_key = prediction_cache.key(version, values)
+        final_prediction = prediction_cache.get(cache_key)
+        if final_prediction is not None:
+            return {"prediction": final_prediction}
+
+        # Scale features and make prediction, coalesced with concurrent requests when enabled
+        if micro_batcher is not None:
+            prediction = await micro_batcher.predict(predictor, values)
+        else:
+            prediction = predictor.predict_row(values)
+        final_prediction = float(np.exp(prediction))
+        prediction_cache.set(cache_key, final_prediction)
         
-        logger.info(f"Prediction made for input: {feature_dict}")
+        logger.info(
+            "Prediction made for input: %s", feature_dict,
+            extra={'sample': True, 'features': feature_dict, 'prediction': final_prediction}
+        )
         return {"prediction": final_prediction}
     
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error making prediction: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def batch_to_matrix(batch):
+    """Convert a batch payload into an (n_rows, n_features) array ordered by Config.FEATURE_COLUMNS"""
+    if (batch.records is None) == (batch.columns is None):
+        raise HTTPException(
+            status_code=400,
+            detail="Provide exactly one of 'records' or 'columns'"
+        )
+
+    if batch.records is not None:
+        matrix = np.array(
+            [[getattr(record, feature) for feature in Config.FEATURE_COLUMNS] for record in batch.records],
+            dtype=np.float64
+        ).reshape(-1, len(Config.FEATURE_COLUMNS))
+    else:
+        missing = [feature for feature in Config.FEATURE_COLUMNS if feature not in batch.columns]
+        if missing:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Missing columns: {', '.join(missing)}"
+            )
+        lengths = {len(batch.columns[feature]) for feature in Config.FEATURE_COLUMNS}
+        if len(lengths) > 1:
+            raise HTTPException(
+                status_code=400,
+                detail="All columns must have the same length"
+            )
+        matrix = np.column_stack(
+            [np.asarray(batch.columns[feature], dtype=np.float64) for feature in Config.FEATURE_COLUMNS]
+        ).reshape(-1, len(Config.FEATURE_COLUMNS))
+
+    if len(matrix) > Config.MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch size exceeds limit of {Config.MAX_BATCH_SIZE}"
+        )
+    return matrix
+
+@app.post("/predict/batch", openapi_extra=json_body(BatchFeatureInput), responses={200: {"model": BatchPredictionResponse}})
+async def predict_batch(request: Request):
+    batch = parse_body(BatchFeatureInput, await request.body())
+    try:
+        input_matrix = batch_to_matrix(batch)
+        n_rows = len(input_matrix)
+
+        # Validate the whole batch in one pass
+        invalid = validator.violations(input_matrix)
+        valid_rows = ~invalid.any(axis=1)
+        errors = validator.errors(invalid)
+
+        # Scale and predict all valid rows in a single call, off the event loop
+        predictions = [None] * n_rows
+        if valid_rows.any():
+            batch_predictions = np.exp(
+                await run_in_threadpool(model_holder.predictor.predict, input_matrix[valid_rows])
+            )
+            for idx, value in zip(np.flatnonzero(valid_rows), batch_predictions):
+                predictions[idx] = float(value)
+
+        logger.info(
+            "Batch prediction made for %d rows (%d invalid)", n_rows, len(errors),
+            extra={'sample': True, 'rows': n_rows, 'invalid_rows': len(errors)}
+        )
+        return {"predictions": predictions, "errors": errors}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error making batch prediction: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/predict/sweep", openapi_extra=json_body(SweepInput), responses={200: {"model": SweepResponse}})
+async def predict_sweep(request: Request):
+    """Prediction curve (one feature) or surface (two features) across the validation range, other features at their base values"""
+    sweep = parse_body(SweepInput, await request.body())
+    base = [getattr(sweep.base, feature) for feature in Config.FEATURE_COLUMNS]
+    try:
+        axes, input_matrix = sweep_grid(base, sweep.features, sweep.points)
+    except SweepError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        predictions = np.exp(await run_in_threadpool(model_holder.predictor.predict, input_matrix))
+        predictions = predictions.reshape([len(axis) for axis in axes])
+        logger.info(
+            "Sweep prediction made over %s (%d rows)", ", ".join(sweep.features), len(input_matrix),
+            extra={'sample': True, 'rows': len(input_matrix)}
+        )
+        return {
+            "features": sweep.features,
+            "axes": [axis.tolist() for axis in axes],
+            "predictions": predictions.tolist()
+        }
+    except Exception as e:
+        logger.error(f"Error making sweep prediction: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post(
+    "/predict/raw",
+    response_class=Response,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/octet-stream": {"schema": {"type": "string", "format": "binary"}}}
+        }
+    }
+)
+async def predict_raw(request: Request, x_internal_token: Optional[str] = Header(None)):
+    """Trusted internal callers: little-endian float64 rows in Config.FEATURE_COLUMNS order in, float64 predictions out (NaN for rows out of range)"""
+    if Config.INTERNAL_TOKEN and x_internal_token != Config.INTERNAL_TOKEN:
+        raise HTTPException(status_code=403, detail="Invalid internal token")
+
+    body = await request.body()
+    row_bytes = 8 * len(Config.FEATURE_COLUMNS)
+    if len(body) % row_bytes:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Body must be a multiple of {row_bytes} bytes ({len(Config.FEATURE_COLUMNS)} float64 per row)"
+        )
+    input_matrix = np.frombuffer(body, dtype='<f8').reshape(-1, len(Config.FEATURE_COLUMNS))
+    if len(input_matrix) > Config.MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch size exceeds limit of {Config.MAX_BATCH_SIZE}"
+        )
+
+    try:
+        valid_rows = validator.valid_rows(input_matrix)
+        predictions = np.full(len(input_matrix), np.nan, dtype='<f8')
+        if valid_rows.any():
+            predictions[valid_rows] = np.exp(
+                await run_in_threadpool(model_holder.predictor.predict, input_matrix[valid_rows])
+            )
+        return Response(content=predictions.tobytes(), media_type="application/octet-stream")
+    except Exception as e:
+        logger.error(f"Error making raw prediction: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+def check_admin_token(token):
+    if not Config.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled, set ADMIN_TOKEN to enable them")
+    if token != Config.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+@app.get("/model")
+async def model_info():
+    return {
+        "version": model_holder.version,
+        "available_versions": model_holder.registry.list_versions()
+    }
+
+@app.get("/cache/stats")
+async def cache_stats():
+    return prediction_cache.stats()
+
+@app.get("/batcher/stats")
+async def batcher_stats():
+    if micro_batcher is None:
+        return {"enabled": False}
+    return {"enabled": True, **micro_batcher.stats()}
+
+@app.post("/admin/reload")
+async def reload_model(request: Optional[ReloadRequest] = None, x_admin_token: Optional[str] = Header(None)):
+    check_admin_token(x_admin_token)
+    version = request.version if request else None
+    if version is not None and version not in model_holder.registry.list_versions():
+        raise HTTPException(status_code=404, detail=f"Unknown model version: {version}")
+
+    try:
+        # Load in a worker thread, requests keep being served by the old model
+        loaded_version = await run_in_threadpool(model_holder.reload, version)
+        return {"version": loaded_version}
+    except Exception as e:
+        logger.error(f"Error reloading model: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host=Config.HOST, port=Config.PORT)
\ No newline at end of file
+    # Each worker loads the serving model from the registry
+    uvicorn.run("app:app", host=Config.HOST, port=Config.PORT, workers=Config.API_WORKERS)
\ No newline at end of file
@@ -0,0 +1,192 @@
+"""Latency and throughput of the prediction API across concurrency levels"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+from pathlib import Path
+import httpx
+import numpy as np
+from config.config import Config
+from src.dataset import load_dataset
+
+def load_payloads(n_payloads, noise=0.0, log_path=None, seed=Config.RANDOM_STATE):
+    """Feature dicts to replay, from logged /predict requests or training rows scaled by N(1, noise)"""
+    if log_path is not None:
+        with open(log_path) as f:
+            records = [json.loads(line) for line in f if line.startswith('{')]
+        rows = [[record['features'][name] for name in Config.FEATURE_COLUMNS]
+                for record in records if 'features' in record]
+        if not rows:
+            raise ValueError(f"No logged /predict requests in {log_path}, was it written with LOG_JSON?")
+        X = np.asarray(rows, dtype=np.float64)
+    else:
+        X = load_dataset(columns=Config.FEATURE_COLUMNS).to_numpy(dtype=np.float64)
+
+    rng = np.random.default_rng(seed)
+    X = X[rng.integers(0, len(X), n_payloads)]
+    if noise:
+        # Stay inside Config.DATA_VALIDATION so noisy rows are not rejected
+        ranges = [Config.get_feature_range(name) for name in Config.FEATURE_COLUMNS]
+        X = np.clip(
+            X * rng.normal(1.0, noise, size=X.shape),
+            [r['min'] for r in ranges],
+            [r['max'] for r in ranges]
+        )
+    return [dict(zip(Config.FEATURE_COLUMNS, row)) for row in X.tolist()]
+
+async def cache_counts(client):
+    """(hits, misses) of the API prediction cache; one worker's counters under uvicorn --workers"""
+    stats = (await client.get('/cache/stats')).json()
+    return stats['hits'], stats['misses']
+
+async def run_level(client, payloads, concurrency, endpoint='/predict'):
+    """Send every payload with `concurrency` requests in flight, timing each one"""
+    latencies = []
+    errors = 0
+    pending = iter(payloads)
+
+    async def worker():
+        nonlocal errors
+        for payload in pending:
+            start = time.perf_counter()
+            response = await client.post(endpoint, json=payload)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall_time = time.perf_counter() - start
+
+    p50, p95, p99 = np.percentile(np.asarray(latencies) * 1000, [50, 95, 99])
+    return {
+        'concurrency': concurrency,
+        'requests': len(latencies),
+        'errors': errors,
+        'seconds': wall_time,
+        'rps': len(latencies) / wall_time,
+        'p50_ms': p50,
+        'p95_ms': p95,
+        'p99_ms': p99,
+        'max_ms': max(latencies) * 1000
+    }
+
+@asynccontextmanager
+async def asgi_client():
+    """Client calling the app in this process, with its lifespan running"""
+    from app import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            yield client
+
+@asynccontextmanager
+async def uvicorn_client(url=None, port=8765, workers=1, timeout=60):
+    """Client for a running API at url, or for a uvicorn server started on port"""
+    server = None
+    if url is None:
+        url = f"http://127.0.0.1:{port}"
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'uvicorn', 'app:app', '--host', '127.0.0.1', '--port', str(port),
+             '--workers', str(workers), '--log-level', 'warning'],
+            stdout=subprocess.DEVNULL
+        )
+
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    try:
+        async with httpx.AsyncClient(base_url=url, limits=limits, timeout=timeout) as client:
+            deadline = time.monotonic() + timeout
+            while True:
+                try:
+                    (await client.get('/model')).raise_for_status()
+                    break
+                except httpx.HTTPError:
+                    if server is not None and server.poll() is not None:
+                        raise RuntimeError("uvicorn exited before serving requests")
+                    if time.monotonic() > deadline:
+                        raise TimeoutError(f"API at {url} not ready after {timeout}s")
+                    await asyncio.sleep(0.2)
+            yield client
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+async def run(args):
+    # A different sample for the warmup and each level, so no level replays rows cached by an earlier one
+    sizes = [args.warmup] + [args.requests] * len(args.concurrency)
+    payload_sets = [
+        load_payloads(n_payloads, noise=args.noise, log_path=args.log, seed=Config.RANDOM_STATE + i)
+        for i, n_payloads in enumerate(sizes)
+    ]
+    if args.mode == 'asgi':
+        client_context = asgi_client()
+    else:
+        client_context = uvicorn_client(args.url, args.port, args.workers)
+
+    results = []
+    async with client_context as client:
+        await run_level(client, payload_sets[0], 1)
+        for concurrency, payloads in zip(args.concurrency, payload_sets[1:]):
+            before = await cache_counts(client)
+            result = await run_level(client, payloads, concurrency)
+            after = await cache_counts(client)
+            hits, misses = after[0] - before[0], after[1] - before[1]
+            result['cache_hit_rate'] = hits / (hits + misses) if hits + misses else 0.0
+            results.append(result)
+            print(
+                f"c={concurrency:>4}: {result['rps']:>9,.0f} req/s  "
+                f"p50 {result['p50_ms']:.2f} ms  p95 {result['p95_ms']:.2f} ms  "
+                f"p99 {result['p99_ms']:.2f} ms  cache hits {result['cache_hit_rate']:.0%}  errors {result['errors']}"
+            )
+        cache_stats = (await client.get('/cache/stats')).json()
+    return results, cache_stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark /predict latency and throughput")
+    parser.add_argument('--mode', choices=['asgi', 'uvicorn'], default='asgi')
+    parser.add_argument('--url', default=None, help="Benchmark an already running API instead of starting uvicorn")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=Config.API_WORKERS, help="uvicorn workers")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16, 64])
+    parser.add_argument('--requests', type=int, default=2000, help="Requests per concurrency level")
+    parser.add_argument('--warmup', type=int, default=100)
+    parser.add_argument('--noise', type=float, default=0.01,
+                        help="Relative noise on replayed rows; 0 replays exact rows, which repeat and partly hit the cache")
+    parser.add_argument('--log', type=Path, default=None, help="Replay features from a JSON log instead of the dataset")
+    parser.add_argument('--output', type=Path, default=None, help="Write results as JSON")
+    args = parser.parse_args(argv)
+
+    results, cache_stats = asyncio.run(run(args))
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump({
+                'mode': args.mode,
+                'commit': git_commit(),
+                'timestamp': datetime.now().isoformat(timespec='seconds'),
+                'cpu_count': os.cpu_count(),
+                'workers': args.workers if args.mode == 'uvicorn' else None,
+                'source': str(args.log or Config.DATA_PATH),
+                'noise': args.noise,
+                'results': results,
+                'cache': cache_stats
+            }, f, indent=4)
+
+if __name__ == "__main__":
+    main()
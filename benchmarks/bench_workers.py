@@ -0,0 +1,62 @@
+"""Throughput of the multi-process scoring pool from 1 worker up to all cores"""
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+import numpy as np
+from config.config import Config
+from src.dataset import load_dataset
+from src.inference import load_serving_predictor
+from src.workers import ScoringPool
+
+def sample_features(n_rows, seed=Config.RANDOM_STATE):
+    """Resample rows of the training data with small noise to build a large input"""
+    df = load_dataset(columns=Config.FEATURE_COLUMNS)
+    rng = np.random.default_rng(seed)
+    X = df.to_numpy(dtype=np.float64)[rng.integers(0, len(df), n_rows)]
+    return X * rng.normal(1.0, 0.01, size=X.shape)
+
+def run(n_rows, repeats, worker_counts):
+    X = sample_features(n_rows)
+    predictor = load_serving_predictor()
+    results = []
+    for n_workers in worker_counts:
+        with ScoringPool(n_workers, predictor) as pool:
+            pool.predict(X[:n_workers])  # warm up workers
+            timings = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                pool.predict(X)
+                timings.append(time.perf_counter() - start)
+        best = min(timings)
+        results.append({
+            'workers': n_workers,
+            'seconds': best,
+            'rows_per_second': n_rows / best
+        })
+        print(f"{n_workers:>3} workers: {n_rows / best:>12,.0f} rows/s")
+
+    baseline = results[0]['rows_per_second']
+    for result in results:
+        result['speedup'] = result['rows_per_second'] / baseline
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark multi-process scoring throughput")
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--output', type=Path, default=None, help="Write results as JSON")
+    args = parser.parse_args(argv)
+
+    worker_counts = sorted({1, *[2 ** i for i in range(1, 8) if 2 ** i < args.max_workers], args.max_workers})
+    results = run(args.rows, args.repeats, worker_counts)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump({'rows': args.rows, 'cpu_count': os.cpu_count(), 'results': results}, f, indent=4)
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,9 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
+import plotly.graph_objects as go
 from config.config import Config
+from src.analytics import load_analytics
+from src.dataset import load_dataset
 from utils.styling import load_css
 
 
@@ -23,20 +25,20 @@ account factors like crime rate, room numbers, and neighborhood characteristics
 The Boston Housing Dataset contains information collected by the U.S Census Service concerning housing in the area of Boston MA.
 """)
 
-# Load and cache data
-@st.cache_data
+# Charts are drawn from precomputed aggregates, so their size does not grow with the dataset
 def load_data():
-    return pd.read_csv(Config.DATA_PATH)
+    return load_analytics()
 
 try:
-    df = load_data()
+    analytics = load_data()
+    price = analytics['features'][Config.TARGET_COLUMN]
     
     # Dataset Overview
     col1, col2, col3 = st.columns(3)
     with col1:
-        st.metric("Total Houses", f"{len(df):,}")
+        st.metric("Total Houses", f"{analytics['rows']:,}")
     with col2:
-        st.metric("Average Price", f"${df['MEDV'].mean():,.2f}")
+        st.metric("Average Price", f"${price['describe']['mean']:,.2f}")
     with col3:
         st.metric("Features", f"{len(Config.FEATURE_COLUMNS)}")
 
@@ -51,7 +53,8 @@ try:
 
     # Data Sample
     with st.expander("View Sample Data"):
-        st.dataframe(df.head())
+        # Only the first rows of the memory-mapped columns are read
+        st.dataframe(load_dataset().head())
 
     # Basic Statistics
     st.header("📊 Basic Statistics")
@@ -59,20 +62,36 @@ try:
     
     with col1:
         st.subheader("Price Distribution")
-        fig = px.histogram(
-            df, 
-            x='MEDV',
-            title="House Price Distribution"
+        edges = price['histogram']['edges']
+        fig = go.Figure(go.Bar(
+            x=[(low + high) / 2 for low, high in zip(edges[:-1], edges[1:])],
+            y=price['histogram']['counts'],
+            width=[high - low for low, high in zip(edges[:-1], edges[1:])]
+        ))
+        fig.update_layout(
+            title="House Price Distribution",
+            xaxis_title='MEDV',
+            yaxis_title='count',
+            bargap=0
         )
         st.plotly_chart(fig, use_container_width=True)
     
     with col2:
         st.subheader("Price by Room Count")
-        fig = px.box(
-            df, 
-            x='RM', 
-            y='MEDV',
-            title="Price Distribution by Number of Rooms"
+        groups = analytics['target_by_feature']['RM']
+        fig = go.Figure(go.Box(
+            x=[group['label'] for group in groups],
+            q1=[group['q1'] for group in groups],
+            median=[group['median'] for group in groups],
+            q3=[group['q3'] for group in groups],
+            lowerfence=[group['lower_fence'] for group in groups],
+            upperfence=[group['upper_fence'] for group in groups],
+            name='MEDV'
+        ))
+        fig.update_layout(
+            title="Price Distribution by Number of Rooms",
+            xaxis_title='RM',
+            yaxis_title='MEDV'
         )
         st.plotly_chart(fig, use_container_width=True)
 
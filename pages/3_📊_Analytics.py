@@ -2,8 +2,10 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+from plotly.subplots import make_subplots
 import numpy as np
 from config.config import Config
+from src.analytics import load_analytics
 import json
 from utils.styling import load_css
 
@@ -11,12 +13,10 @@ st.set_page_config(page_title="Analytics", page_icon="📊", layout="wide")
 
 load_css()
 
-# Load and cache data with proper cache decorator
-@st.cache_data(ttl=3600)
 def load_data():
-    """Load and cache the dataset"""
+    """Load the precomputed dataset aggregates, computed once per dataset content"""
     try:
-        return pd.read_csv(Config.DATA_PATH)
+        return load_analytics()
     except Exception as e:
         st.error(f"Error loading data: {e}")
         return None
@@ -44,11 +44,11 @@ def load_model_artifacts():
         return None, None
 
 try:
-    # Load data and model artifacts
-    df = load_data()
+    # Load dataset aggregates and model artifacts
+    analytics = load_data()
     metrics, feature_importance = load_model_artifacts()
 
-    if df is not None:
+    if analytics is not None:
         st.title("📊 Data Analytics & Model Performance")
 
         # Create tabs
@@ -66,27 +66,45 @@ try:
                 Config.FEATURE_COLUMNS
             )
             
+            summary = analytics['features'][feature]
             col1, col2 = st.columns(2)
             
             with col1:
-                fig = px.histogram(
-                    df, 
-                    x=feature,
-                    marginal="box",
-                    title=f"Distribution of {feature}"
-                )
+                # Histogram with a box marginal, drawn from precomputed bins and quartiles
+                edges = np.array(summary['histogram']['edges'])
+                box = summary['box']
+                fig = make_subplots(rows=2, cols=1, row_heights=[0.2, 0.8], shared_xaxes=True, vertical_spacing=0.02)
+                fig.add_trace(go.Box(
+                    q1=[box['q1']], median=[box['median']], q3=[box['q3']],
+                    lowerfence=[box['lower_fence']], upperfence=[box['upper_fence']],
+                    orientation='h', name=feature, showlegend=False
+                ), row=1, col=1)
+                fig.add_trace(go.Bar(
+                    x=(edges[:-1] + edges[1:]) / 2,
+                    y=summary['histogram']['counts'],
+                    width=np.diff(edges),
+                    name=feature,
+                    showlegend=False
+                ), row=2, col=1)
+                fig.update_layout(title=f"Distribution of {feature}", bargap=0)
+                fig.update_yaxes(showticklabels=False, row=1, col=1)
+                fig.update_yaxes(title_text="count", row=2, col=1)
+                fig.update_xaxes(title_text=feature, row=2, col=1)
                 st.plotly_chart(fig, use_container_width=True)
             
             with col2:
-                stats = df[feature].describe()
+                stats = pd.Series(summary['describe'], name=feature)
                 st.dataframe(stats)
+                if box['outliers']:
+                    st.caption(f"{box['outliers']} values outside the box whiskers")
 
         with tab2:
             st.header("Feature Relationships")
             
-            corr = df[Config.FEATURE_COLUMNS + [Config.TARGET_COLUMN]].corr()
             fig = px.imshow(
-                corr,
+                analytics['correlation'],
+                x=analytics['columns'],
+                y=analytics['columns'],
                 title="Feature Correlation Matrix",
                 color_continuous_scale="RdBu"
             )
@@ -102,14 +120,28 @@ try:
                     index=1 if len([Config.TARGET_COLUMN]) > 1 else 0
                 )
             
+            # Sampled points, with the least-squares line fitted on the full dataset
+            sample = pd.DataFrame(analytics['sample'])
+            fit = analytics['regression'][x_feature]
             fig = px.scatter(
-                df,
+                sample,
                 x=x_feature,
                 y=y_feature,
-                title=f"{x_feature} vs {y_feature}",
-                trendline="ols"
+                title=f"{x_feature} vs {y_feature} (R² {fit['r2']:.3f})"
             )
+            x_range = np.array([
+                analytics['features'][x_feature]['describe']['min'],
+                analytics['features'][x_feature]['describe']['max']
+            ])
+            fig.add_trace(go.Scatter(
+                x=x_range,
+                y=fit['slope'] * x_range + fit['intercept'],
+                mode='lines',
+                name='OLS fit'
+            ))
             st.plotly_chart(fig, use_container_width=True)
+            if len(sample) < analytics['rows']:
+                st.caption(f"Showing {len(sample):,} of {analytics['rows']:,} rows")
 
         with tab3:
             st.header("Model Performance")
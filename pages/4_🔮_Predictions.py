@@ -1,9 +1,13 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import requests
 import plotly.express as px
+import plotly.graph_objects as go
 from config.config import Config
+from src.client import PredictionError, get_prediction_client
+from src.history import PredictionHistory
+from src.plotting import binned_box_stats
+from src.validation import validator
 from utils.styling import load_css
 
 st.set_page_config(page_title="Predictions", page_icon="🔮", layout="wide")
@@ -11,9 +15,14 @@ st.set_page_config(page_title="Predictions", page_icon="🔮", layout="wide")
 # Load CSS
 load_css()
 
+@st.cache_resource
+def get_client():
+    """One client per server process: a loaded model or a pooled HTTP session"""
+    return get_prediction_client()
+
 # Initialize session state
 if 'predictions' not in st.session_state:
-    st.session_state.predictions = []
+    st.session_state.predictions = PredictionHistory()
 
 # Prediction Form
 with st.form("prediction_form"):
@@ -24,24 +33,24 @@ with st.form("prediction_form"):
     with col1:
         lstat = st.slider(
             "Lower Status Population (%)",
-            min_value=0.0,
-            max_value=40.0,
+            min_value=validator.bounds('LSTAT')[0],
+            max_value=validator.bounds('LSTAT')[1],
             value=10.0,
             help=Config.FEATURE_DESCRIPTIONS['LSTAT']
         )
         
         rm = st.slider(
             "Average Rooms",
-            min_value=3.0,
-            max_value=9.0,
+            min_value=validator.bounds('RM')[0],
+            max_value=validator.bounds('RM')[1],
             value=6.0,
             help=Config.FEATURE_DESCRIPTIONS['RM']
         )
         
         crim = st.number_input(
             "Crime Rate",
-            min_value=0.0,
-            max_value=100.0,
+            min_value=validator.bounds('CRIM')[0],
+            max_value=validator.bounds('CRIM')[1],
             value=0.1,
             step=0.01,
             help=Config.FEATURE_DESCRIPTIONS['CRIM']
@@ -50,24 +59,24 @@ with st.form("prediction_form"):
     with col2:
         ptratio = st.slider(
             "Pupil-Teacher Ratio",
-            min_value=12.0,
-            max_value=22.0,
+            min_value=validator.bounds('PTRATIO')[0],
+            max_value=validator.bounds('PTRATIO')[1],
             value=15.0,
             help=Config.FEATURE_DESCRIPTIONS['PTRATIO']
         )
         
         indus = st.slider(
             "Industrial Area (%)",
-            min_value=0.0,
-            max_value=30.0,
+            min_value=validator.bounds('INDUS')[0],
+            max_value=validator.bounds('INDUS')[1],
             value=10.0,
             help=Config.FEATURE_DESCRIPTIONS['INDUS']
         )
         
         tax = st.slider(
             "Property Tax Rate",
-            min_value=150.0,
-            max_value=800.0,
+            min_value=validator.bounds('TAX')[0],
+            max_value=validator.bounds('TAX')[1],
             value=300.0,
             help=Config.FEATURE_DESCRIPTIONS['TAX']
         )
@@ -75,88 +84,126 @@ with st.form("prediction_form"):
     with col3:
         nox = st.slider(
             "Nitric Oxide Concentration",
-            min_value=0.3,
-            max_value=0.9,
+            min_value=validator.bounds('NOX')[0],
+            max_value=validator.bounds('NOX')[1],
             value=0.5,
             help=Config.FEATURE_DESCRIPTIONS['NOX']
         )
         
         b = st.slider(
             "Black Population Ratio",
-            min_value=0.0,
-            max_value=400.0,
+            min_value=validator.bounds('B')[0],
+            max_value=validator.bounds('B')[1],
             value=300.0,
             help=Config.FEATURE_DESCRIPTIONS['B']
         )
     
     submitted = st.form_submit_button("🏠 Predict Price")
 
-if submitted:
-    input_data = {
-        "LSTAT": lstat,
-        "RM": rm,
-        "CRIM": crim,
-        "PTRATIO": ptratio,
-        "INDUS": indus,
-        "TAX": tax,
-        "NOX": nox,
-        "B": b
-    }
+input_data = {
+    "LSTAT": lstat,
+    "RM": rm,
+    "CRIM": crim,
+    "PTRATIO": ptratio,
+    "INDUS": indus,
+    "TAX": tax,
+    "NOX": nox,
+    "B": b
+}
 
-# Update API endpoint URL untuk Docker
-# API_URL = "http://fastapi:8000"  # Gunakan nama service dari docker-compose
+if submitted:
+    # Same range check as the API, so bad input never makes a request
+    invalid = validator.invalid_features([input_data[feature] for feature in Config.FEATURE_COLUMNS])
+    if invalid:
+        st.error(f"Values out of range: {', '.join(invalid)}")
+        st.stop()
     
     try:
+        # Remote mode uses Config.API_BASE_URL (http://fastapi:8000 under docker-compose)
         with st.spinner('Making prediction...'):
-            response = requests.post(
-                "http://localhost:8000/predict",
-                json=input_data
-            )
-            
-            #--- Jika pake docker ---
-            # # Update prediction request
-            # response = requests.post(
-            #     f"{API_URL}/predict",
-            #     json=input_data
-            # )
-            
-            if response.status_code == 200:
-                prediction = response.json()["prediction"]
-                
-                # Store prediction
-                st.session_state.predictions.append({
-                    "prediction": prediction,
-                    **input_data
-                })
-                
-                st.success(f"### Predicted House Price: ${prediction:,.2f}")
-                
-                # Display feature values
-                st.subheader("Feature Values Used")
-                feature_df = pd.DataFrame([input_data]).T
-                feature_df.columns = ['Value']
-                st.dataframe(feature_df)
-                
-            else:
-                st.error(f"Error making prediction: {response.text}")
-                
-    except requests.exceptions.ConnectionError:
-        st.error("Error connecting to the prediction service. Please make sure the API is running.")
+            prediction = get_client().predict(input_data)
+        
+        # Store prediction
+        st.session_state.predictions.append(input_data, prediction)
+        
+        st.success(f"### Predicted House Price: ${prediction:,.2f}")
+        
+        # Display feature values
+        st.subheader("Feature Values Used")
+        feature_df = pd.DataFrame([input_data]).T
+        feature_df.columns = ['Value']
+        st.dataframe(feature_df)
+        
+    except PredictionError as e:
+        st.error(str(e))
     except Exception as e:
         st.error(f"An error occurred: {str(e)}")
 
+# What-if sweep around the values in the form, predicted in one batch
+with st.expander("What-if Sensitivity"):
+    st.caption("Vary one or two features across their valid range while the others keep the values above.")
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        vary = st.multiselect(
+            "Features to vary",
+            Config.FEATURE_COLUMNS,
+            default=['RM'],
+            max_selections=2,
+            format_func=lambda feature: f"{feature} - {Config.FEATURE_DESCRIPTIONS[feature]}"
+        )
+    with col2:
+        points = st.slider(
+            "Points per feature",
+            min_value=10,
+            max_value=Config.SWEEP_MAX_POINTS,
+            value=Config.SWEEP_DEFAULT_POINTS
+        )
+    
+    if st.button("Run Sweep", disabled=not vary):
+        try:
+            with st.spinner('Running sweep...'):
+                axes, surface = get_client().sweep(input_data, vary, points)
+            
+            if len(vary) == 1:
+                fig = px.line(
+                    x=axes[0],
+                    y=surface,
+                    title=f'Predicted Price vs {vary[0]}',
+                    labels={'x': vary[0], 'y': 'Predicted Price ($)'}
+                )
+                fig.add_vline(x=input_data[vary[0]], line_dash='dash')
+            else:
+                # Rows follow the first feature, columns the second
+                fig = go.Figure(go.Heatmap(
+                    x=axes[1],
+                    y=axes[0],
+                    z=surface,
+                    colorbar={'title': 'Price ($)'}
+                ))
+                fig.update_layout(
+                    title=f'Predicted Price over {vary[0]} and {vary[1]}',
+                    xaxis_title=vary[1],
+                    yaxis_title=vary[0]
+                )
+            st.plotly_chart(fig, use_container_width=True)
+            st.caption(f"Price range: ${np.min(surface):,.2f} - ${np.max(surface):,.2f}")
+        
+        except PredictionError as e:
+            st.error(str(e))
+        except Exception as e:
+            st.error(f"An error occurred: {str(e)}")
+
 # Display prediction history
-if st.session_state.predictions:
+history = st.session_state.predictions
+if len(history):
     st.header("Prediction History")
     
-    df_pred = pd.DataFrame(st.session_state.predictions)
-    
     col1, col2 = st.columns([2, 1])
     
     with col1:
         st.subheader("Recent Predictions")
-        for idx, pred in enumerate(df_pred.tail(5).iloc[::-1].to_dict('records')):
-            with st.expander(f"Prediction {len(df_pred) - idx}", expanded=idx == 0):
+        for idx, pred in enumerate(history.recent(5)):
+            with st.expander(f"Prediction {pred['number']}", expanded=idx == 0):
                 cols = st.columns(4)
                 with cols[0]:
                     st.metric("Price", f"${pred['prediction']:,.2f}")
@@ -169,66 +216,74 @@ if st.session_state.predictions:
     
     with col2:
         if st.button("Clear Prediction History"):
-            st.session_state.predictions = []
-            st.experimental_rerun()
+            history.clear()
+            st.session_state.pop('history_csv', None)
+            st.rerun()
     
     # Visualization section
     st.header("Prediction Analysis")
+    if history.count > len(history):
+        st.caption(f"Charts show the latest {len(history):,} predictions")
+    
+    rooms = history.column('RM')
+    prices = history.column('prediction')
     
     col1, col2 = st.columns(2)
     
     with col1:
         # Scatter plot of predictions vs rooms
         fig1 = px.scatter(
-            df_pred,
-            x='RM',
-            y='prediction',
+            x=rooms,
+            y=prices,
             title='Predicted Price vs Number of Rooms',
             labels={
-                'RM': 'Number of Rooms',
-                'prediction': 'Predicted Price ($)'
+                'x': 'Number of Rooms',
+                'y': 'Predicted Price ($)'
             }
         )
         st.plotly_chart(fig1, use_container_width=True)
     
     with col2:
-        # Create manual room ranges for grouping
-        df_pred['Room_Range'] = pd.cut(
-            df_pred['RM'],
-            bins=[2, 4, 5, 6, 7, 8, 9],
-            labels=['2-4', '4-5', '5-6', '6-7', '7-8', '8-9']
-        )
-        
-        fig2 = px.box(
-            df_pred,
-            x='Room_Range',
-            y='prediction',
+        # Manual room ranges for grouping
+        groups = binned_box_stats(rooms, prices, np.array([2, 4, 5, 6, 7, 8, 9]))
+        fig2 = go.Figure(go.Box(
+            x=[group['label'] for group in groups],
+            q1=[group['q1'] for group in groups],
+            median=[group['median'] for group in groups],
+            q3=[group['q3'] for group in groups],
+            lowerfence=[group['lower_fence'] for group in groups],
+            upperfence=[group['upper_fence'] for group in groups]
+        ))
+        fig2.update_layout(
             title='Price Distribution by Room Ranges',
-            labels={
-                'Room_Range': 'Room Ranges',
-                'prediction': 'Predicted Price ($)'
-            }
+            xaxis_title='Room Ranges',
+            yaxis_title='Predicted Price ($)'
         )
         st.plotly_chart(fig2, use_container_width=True)
     
-    # Statistics
+    # Statistics, maintained as predictions are added
     st.subheader("Prediction Statistics")
     stats_cols = st.columns(4)
     
     with stats_cols[0]:
-        st.metric("Average Price", f"${df_pred['prediction'].mean():,.2f}")
+        st.metric("Average Price", f"${history.mean:,.2f}")
     with stats_cols[1]:
-        st.metric("Highest Price", f"${df_pred['prediction'].max():,.2f}")
+        st.metric("Highest Price", f"${history.max:,.2f}")
     with stats_cols[2]:
-        st.metric("Lowest Price", f"${df_pred['prediction'].min():,.2f}")
+        st.metric("Lowest Price", f"${history.min:,.2f}")
     with stats_cols[3]:
-        st.metric("Total Predictions", len(df_pred))
+        st.metric("Total Predictions", history.count)
     
-    # Download predictions
-    if not df_pred.empty:
+    # Download predictions; the CSV is only built on request and reused until the history changes
+    csv = st.session_state.get('history_csv')
+    if csv is None or csv[0] != history.count:
+        if st.button("Prepare Prediction History Download"):
+            csv = (history.count, history.to_csv())
+            st.session_state.history_csv = csv
+    if csv is not None and csv[0] == history.count:
         st.download_button(
             label="Download Prediction History",
-            data=df_pred.to_csv(index=False).encode('utf-8'),
+            data=csv[1],
             file_name="house_price_predictions.csv",
             mime="text/csv"
         )
@@ -0,0 +1,115 @@
+import argparse
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from config.config import Config
+from src.inference import load_serving_predictor
+from src.validation import validator
+from src.workers import ScoringPool
+from utils.logger import setup_logger
+
+logger = setup_logger('score')
+
+PARQUET_SUFFIXES = ('.parquet', '.pq')
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Score a CSV or Parquet file in chunks")
+    parser.add_argument('input', type=Path, help="Input CSV or Parquet file")
+    parser.add_argument('output', type=Path, help="Output CSV or Parquet file")
+    parser.add_argument('--chunk-size', type=int, default=Config.SCORE_CHUNK_SIZE,
+                        help="Rows per chunk")
+    parser.add_argument('--id-column', default=None,
+                        help="Input column copied to the output to identify rows")
+    parser.add_argument('--workers', type=int, default=Config.SCORE_WORKERS,
+                        help="Worker processes sharing the loaded model (0 for all cores)")
+    return parser.parse_args(argv)
+
+def _require_pyarrow():
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet input/output requires pyarrow (pip install pyarrow)") from e
+    return pq
+
+def iter_chunks(path, chunk_size, columns):
+    """Yield DataFrames of at most chunk_size rows with the given columns"""
+    if path.suffix.lower() in PARQUET_SUFFIXES:
+        pq = _require_pyarrow()
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size, usecols=columns)
+
+class ChunkWriter:
+    """Append scored chunks to a CSV or Parquet file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.parquet = path.suffix.lower() in PARQUET_SUFFIXES
+        self._writer = None
+        self._header = True
+
+    def write(self, df):
+        if self.parquet:
+            import pyarrow as pa
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._writer is None:
+                self._writer = _require_pyarrow().ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        else:
+            df.to_csv(self.path, mode='w' if self._header else 'a', header=self._header, index=False)
+            self._header = False
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+def score_file(input_path, output_path, chunk_size=None, id_column=None, predictor=None, workers=1):
+    """Score input_path chunk by chunk and write predictions to output_path"""
+    chunk_size = chunk_size or Config.SCORE_CHUNK_SIZE
+    predictor = predictor or load_serving_predictor()
+    columns = Config.FEATURE_COLUMNS + ([id_column] if id_column else [])
+
+    pool = None
+    if workers != 1:
+        # Each chunk is split across the workers
+        pool = predictor = ScoringPool(workers or None, predictor)
+
+    writer = ChunkWriter(output_path)
+    n_rows = n_invalid = 0
+    try:
+        for chunk in iter_chunks(input_path, chunk_size, columns):
+            X = chunk[Config.FEATURE_COLUMNS].to_numpy(dtype=np.float64)
+            valid = validator.valid_rows(X)
+
+            predictions = np.full(len(X), np.nan)
+            if valid.any():
+                predictions[valid] = np.exp(predictor.predict(X[valid]))
+
+            result = pd.DataFrame({'prediction': predictions, 'valid': valid})
+            if id_column:
+                result.insert(0, id_column, chunk[id_column].to_numpy())
+            writer.write(result)
+
+            n_rows += len(X)
+            n_invalid += int((~valid).sum())
+            logger.info(f"Scored {n_rows} rows")
+    finally:
+        writer.close()
+        if pool is not None:
+            pool.close()
+
+    logger.info(f"Scoring completed: {n_rows} rows, {n_invalid} invalid, written to {output_path}")
+    return n_rows, n_invalid
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        score_file(args.input, args.output, args.chunk_size, args.id_column, workers=args.workers)
+    except Exception as e:
+        logger.error(f"Error in scoring: {str(e)}")
+        raise
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import json
+import os
+import threading
+import numpy as np
+from config.config import Config
+from src.dataset import dataset_manifest, load_dataset
+from src.plotting import binned_box_stats, box_stats, nice_edges, stratified_sample
+from utils.logger import setup_logger
+
+logger = setup_logger('analytics')
+
+ANALYTICS_FORMAT_VERSION = 2
+QUANTILES = (0.0, 0.25, 0.5, 0.75, 1.0)
+
+_lock = threading.Lock()
+_loaded = {}
+
+def _feature_summary(values, bins):
+    values = values[~np.isnan(values)]
+    q = np.quantile(values, QUANTILES).tolist() if len(values) else [float('nan')] * len(QUANTILES)
+    counts, edges = np.histogram(values, bins=bins) if len(values) else (np.zeros(bins), np.zeros(bins + 1))
+    return {
+        'describe': {
+            'count': int(len(values)),
+            'mean': float(values.mean()) if len(values) else float('nan'),
+            'std': float(values.std(ddof=1)) if len(values) > 1 else float('nan'),
+            'min': q[0],
+            '25%': q[1],
+            '50%': q[2],
+            '75%': q[3],
+            'max': q[4]
+        },
+        'histogram': {'edges': edges.tolist(), 'counts': counts.astype(int).tolist()},
+        'box': box_stats(values)
+    }
+
+def compute_analytics(df, bins=None, sample_size=None):
+    """Aggregates behind the Analytics page, small enough to ship to the browser"""
+    bins = bins or Config.ANALYTICS_BINS
+    sample_size = sample_size or Config.ANALYTICS_SAMPLE_SIZE
+    columns = Config.FEATURE_COLUMNS + [Config.TARGET_COLUMN]
+    data = {name: np.asarray(df[name], dtype=np.float64) for name in columns}
+
+    # Correlations and fits over rows complete in every column, like DataFrame.corr per pair on clean data
+    complete = np.all([~np.isnan(values) for values in data.values()], axis=0)
+    matrix = np.vstack([values[complete] for values in data.values()])
+    correlation = np.corrcoef(matrix) if complete.sum() > 1 else np.full((len(columns), len(columns)), np.nan)
+
+    target = data[Config.TARGET_COLUMN][complete]
+    regression = {}
+    for name in Config.FEATURE_COLUMNS:
+        x = data[name][complete]
+        slope, intercept = np.polyfit(x, target, 1) if len(x) > 1 and np.ptp(x) > 0 else (0.0, float(np.mean(target)))
+        residual = target - (slope * x + intercept)
+        total = np.sum(np.square(target - target.mean()))
+        regression[name] = {
+            'slope': float(slope),
+            'intercept': float(intercept),
+            'r2': float(1.0 - np.sum(np.square(residual)) / total) if total > 0 else 0.0
+        }
+
+    target_by_feature = {
+        name: binned_box_stats(
+            data[name], data[Config.TARGET_COLUMN],
+            nice_edges(np.nanmin(data[name]), np.nanmax(data[name]), Config.PLOT_GROUP_BINS)
+        )
+        for name in Config.FEATURE_COLUMNS
+    }
+
+    n_rows = len(df)
+    sample_idx = stratified_sample(data[Config.TARGET_COLUMN], sample_size, seed=Config.RANDOM_STATE)
+
+    return {
+        'format_version': ANALYTICS_FORMAT_VERSION,
+        'rows': int(n_rows),
+        'columns': columns,
+        'features': {name: _feature_summary(data[name], bins) for name in columns},
+        'correlation': correlation.tolist(),
+        'regression': regression,
+        'target_by_feature': target_by_feature,
+        'sample': {name: data[name][sample_idx].tolist() for name in columns}
+    }
+
+def load_analytics(path=None):
+    """Analytics of a dataset, computed once per dataset content and stored next to its columnar cache"""
+    cache_dir, manifest = dataset_manifest(path)
+    digest = manifest['sha256']
+    with _lock:
+        cached = _loaded.get(str(cache_dir))
+        if cached is not None and cached['dataset_sha256'] == digest:
+            return cached
+
+        analytics_path = cache_dir / "analytics.json"
+        analytics = None
+        if analytics_path.exists():
+            with open(analytics_path) as f:
+                analytics = json.load(f)
+            if (analytics.get('format_version') != ANALYTICS_FORMAT_VERSION
+                    or analytics.get('dataset_sha256') != digest):
+                analytics = None
+
+        if analytics is None:
+            analytics = compute_analytics(load_dataset(path))
+            analytics['dataset_sha256'] = digest
+            tmp_path = f"{analytics_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(analytics, f)
+            os.replace(tmp_path, analytics_path)
+            logger.info(f"Analytics computed for {manifest['source']} ({analytics['rows']} rows)")
+
+        _loaded[str(cache_dir)] = analytics
+        return analytics
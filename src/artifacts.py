@@ -0,0 +1,72 @@
+import json
+import os
+import pickle
+from datetime import datetime
+import numpy as np
+from config.config import Config
+from src.inference import FastPredictor, pipeline_iteration_range, scaler_arrays
+from utils.logger import setup_logger
+
+logger = setup_logger('artifacts')
+
+NATIVE_FORMAT_VERSION = 1
+
+BOOSTER_FILE = "booster.ubj"
+MEAN_FILE = "scaler_mean.npy"
+SCALE_FILE = "scaler_scale.npy"
+MANIFEST_FILE = "manifest.json"
+
+def export_native_model(model, path=None):
+    """Save the trained pipeline and scaler without pickle: UBJSON booster, .npy scaler arrays and a manifest"""
+    path = path or Config.NATIVE_MODEL_PATH
+    with open(Config.SCALER_PATH, 'rb') as f:
+        scaler = pickle.load(f)
+
+    import sklearn
+    import xgboost
+
+    os.makedirs(path, exist_ok=True)
+    regressor = model.named_steps['regressor']
+    regressor.get_booster().save_model(os.path.join(path, BOOSTER_FILE))
+    mean, scale = scaler_arrays(scaler)
+    np.save(os.path.join(path, MEAN_FILE), mean)
+    np.save(os.path.join(path, SCALE_FILE), scale)
+
+    manifest = {
+        'format_version': NATIVE_FORMAT_VERSION,
+        'feature_columns': Config.FEATURE_COLUMNS,
+        'target_transform': 'log',
+        'iteration_range': list(pipeline_iteration_range(model)),
+        'missing': None if np.isnan(regressor.missing) else float(regressor.missing),
+        'xgboost_version': xgboost.__version__,
+        'sklearn_version': sklearn.__version__,
+        'created': datetime.now().isoformat(timespec='seconds')
+    }
+    with open(os.path.join(path, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=4)
+
+    logger.info(f"Native model exported to {path}")
+    return manifest
+
+def load_native_predictor(path=None):
+    """Load native artifacts into a FastPredictor, without unpickling anything"""
+    path = path or Config.NATIVE_MODEL_PATH
+    with open(os.path.join(path, MANIFEST_FILE)) as f:
+        manifest = json.load(f)
+
+    if manifest['format_version'] > NATIVE_FORMAT_VERSION:
+        raise ValueError(f"Unsupported native model format version {manifest['format_version']}")
+    if manifest['feature_columns'] != list(Config.FEATURE_COLUMNS):
+        raise ValueError(f"Native model features {manifest['feature_columns']} do not match Config.FEATURE_COLUMNS")
+
+    import xgboost
+
+    booster = xgboost.Booster()
+    booster.load_model(os.path.join(path, BOOSTER_FILE))
+    return FastPredictor(
+        booster,
+        np.load(os.path.join(path, MEAN_FILE), mmap_mode='r'),
+        np.load(os.path.join(path, SCALE_FILE), mmap_mode='r'),
+        iteration_range=manifest['iteration_range'],
+        missing=np.nan if manifest['missing'] is None else manifest['missing']
+    )
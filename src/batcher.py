@@ -0,0 +1,91 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import numpy as np
+from config.config import Config
+
+class MicroBatcher:
+    """Coalesce concurrent single-row predictions into one vectorized call in a worker thread"""
+
+    def __init__(self, max_batch_size=None, max_wait=None, threads=None):
+        self.max_batch_size = max_batch_size or Config.MICRO_BATCH_MAX_SIZE
+        self.max_wait = Config.MICRO_BATCH_MAX_WAIT if max_wait is None else max_wait
+        self._executor = ThreadPoolExecutor(
+            max_workers=threads or Config.MICRO_BATCH_THREADS,
+            thread_name_prefix='micro-batch'
+        )
+        self._pending = []
+        self._timer = None
+        self._running = 0
+        self._stats_lock = threading.Lock()
+        self.batches = 0
+        self.rows = 0
+        self.max_batch_seen = 0
+
+    async def predict(self, predictor, values):
+        """Log price for one row of feature values, predicted as part of a batch"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((predictor, values, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait if self._running else 0, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        loop = asyncio.get_running_loop()
+        groups = {}
+        for item in batch:
+            groups.setdefault(id(item[0]), []).append(item)
+        for items in groups.values():
+            X = np.array([values for _, values, _ in items], dtype=np.float64)
+            self._running += 1
+            task = loop.run_in_executor(self._executor, self._run, items[0][0], X)
+            task.add_done_callback(partial(self._resolve, items))
+
+    def _run(self, predictor, X):
+        predictions = predictor.predict(X)
+        with self._stats_lock:
+            self.batches += 1
+            self.rows += len(X)
+            self.max_batch_seen = max(self.max_batch_seen, len(X))
+        return predictions
+
+    def _resolve(self, items, task):
+        # Runs on the event loop thread
+        self._running -= 1
+        if self._pending and not self._running:
+            self._flush()
+
+        error = task.exception()
+        predictions = None if error is not None else task.result()
+        for index, (_, _, future) in enumerate(items):
+            if future.done():  # caller went away
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(predictions[index])  # keep the predictor dtype, exp is applied by the caller
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                'batches': self.batches,
+                'rows': self.rows,
+                'mean_batch_size': self.rows / self.batches if self.batches else 0.0,
+                'max_batch_size_seen': self.max_batch_seen,
+                'max_batch_size': self.max_batch_size,
+                'max_wait': self.max_wait
+            }
+
+    def close(self):
+        self._executor.shutdown(wait=True)
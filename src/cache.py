@@ -0,0 +1,127 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from config.config import Config
+from utils.logger import setup_logger
+
+logger = setup_logger('cache')
+
+def file_digest(path, chunk_size=1 << 20):
+    """SHA-256 of a file, or of all files in a directory, read in chunks"""
+    digest = hashlib.sha256()
+    paths = sorted(p for p in Path(path).rglob('*') if p.is_file()) if os.path.isdir(path) else [Path(path)]
+    for file_path in paths:
+        digest.update(file_path.name.encode('utf-8'))
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+def hash_payload(payload):
+    """SHA-256 of a JSON-serializable payload with stable key order"""
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+def pipeline_signature(pipeline):
+    """Scalar hyperparameters of the pipeline's regressor, excluding thread counts"""
+    return {
+        key: value for key, value in pipeline.get_params().items()
+        if key.startswith('regressor__') and key != 'regressor__n_jobs'
+        and (value is None or isinstance(value, (bool, int, float, str)))
+    }
+
+def data_cache_key():
+    """Key for the prepared data: source file content, features and split settings"""
+    return hash_payload({
+        'data': file_digest(Config.DATA_PATH),
+        'features': Config.FEATURE_COLUMNS,
+        'target': Config.TARGET_COLUMN,
+        'test_size': Config.TEST_SIZE,
+        'random_state': Config.RANDOM_STATE,
+        'cv_folds': Config.CV_FOLDS
+    })
+
+def training_cache_key(data_key, pipeline, param_grid, engine):
+    """Key for a full training run: data key plus everything that drives the search"""
+    return hash_payload({
+        'data': data_key,
+        'pipeline': pipeline_signature(pipeline),
+        'param_grid': param_grid,
+        'engine': engine.name,
+        'halving': [Config.HALVING_FACTOR, Config.HALVING_MIN_FRACTION] if engine.name == 'halving' else None
+    })
+
+def _write_json_atomic(path, payload):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(payload, f, indent=4, default=str)
+    os.replace(tmp_path, path)
+
+class TrainingCache:
+    """Manifest of the last training run, used to skip byte-identical retrains"""
+
+    ARTIFACTS = ('MODEL_PATH', 'SCALER_PATH', 'METRICS_PATH', 'FEATURE_IMPORTANCE_PATH',
+                 'COMPILED_MODEL_PATH', 'NATIVE_MODEL_PATH', 'SEARCH_RESULTS_PATH')
+
+    def __init__(self, path=None):
+        self.path = path or Config.TRAINING_CACHE_DIR / "training_manifest.json"
+
+    def lookup(self, key):
+        """Return cached metrics if key matches and all artifacts are unchanged, else None"""
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path) as f:
+            manifest = json.load(f)
+        if manifest.get('key') != key:
+            return None
+
+        for name in self.ARTIFACTS:
+            path = getattr(Config, name)
+            if not path.exists() or file_digest(path) != manifest['artifacts'].get(name):
+                logger.info(f"Cached artifact {path.name} missing or modified")
+                return None
+        return manifest['metrics']
+
+    def store(self, key, metrics):
+        """Record the current artifacts as the result of the run identified by key"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        _write_json_atomic(self.path, {
+            'key': key,
+            'metrics': metrics,
+            'artifacts': {name: file_digest(getattr(Config, name)) for name in self.ARTIFACTS}
+        })
+
+class FoldCache:
+    """Per-fold CV results keyed on data, candidate parameters and fold index"""
+
+    def __init__(self, data_key, directory=None):
+        self.data_key = data_key
+        self.path = (directory or Config.TRAINING_CACHE_DIR / "folds") / f"{data_key}.json"
+        self.entries = {}
+        if self.path.exists():
+            with open(self.path) as f:
+                self.entries = json.load(f)
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, pipeline, params, fold):
+        """Key for one fold of one candidate, params overriding the pipeline defaults"""
+        params = {k: v for k, v in {**pipeline_signature(pipeline), **params}.items() if k != 'regressor__n_jobs'}
+        return hash_payload({'params': params, 'fold': fold})
+
+    def get(self, key):
+        """Return the cached (score, fit_time) for key, or None"""
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return tuple(entry)
+
+    def set(self, key, result):
+        self.entries[key] = list(result)
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        _write_json_atomic(self.path, self.entries)
@@ -0,0 +1,125 @@
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config.config import Config
+from src.sweep import SweepError, sweep_grid
+from src.validation import validator
+from utils.logger import setup_logger
+
+logger = setup_logger('client')
+
+class PredictionError(Exception):
+    """Prediction failed; the message is safe to show to the user"""
+
+class LocalPredictionClient:
+    """Predict in this process with the same model and validation as the API"""
+
+    mode = 'local'
+
+    def __init__(self, holder=None):
+        from src.registry import ModelHolder
+
+        self.holder = holder or ModelHolder()
+        self.holder.load()
+        self.holder.start_watcher()
+
+    def predict(self, features):
+        """Price for a dict of feature values"""
+        values = [features[feature] for feature in Config.FEATURE_COLUMNS]
+        invalid = validator.invalid_features(values)
+        if invalid:
+            raise PredictionError(f"Invalid value for {invalid[0]}")
+        # predict, not predict_row: Streamlit sessions share this client across threads
+        return float(np.exp(self.holder.predictor.predict([values])[0]))
+
+    def predict_batch(self, X):
+        """Prices for an (n_rows, n_features) array ordered by Config.FEATURE_COLUMNS, NaN for invalid rows"""
+        X = np.asarray(X, dtype=np.float64).reshape(-1, len(Config.FEATURE_COLUMNS))
+        valid_rows = validator.valid_rows(X)
+        predictions = np.full(len(X), np.nan)
+        if valid_rows.any():
+            predictions[valid_rows] = np.exp(self.holder.predictor.predict(X[valid_rows]))
+        return predictions
+
+    def sweep(self, features, vary, points=None):
+        """(axes, predictions) varying one or two features of a dict of feature values across their range"""
+        base = [features[feature] for feature in Config.FEATURE_COLUMNS]
+        try:
+            axes, X = sweep_grid(base, vary, points)
+        except SweepError as e:
+            raise PredictionError(str(e)) from e
+        predictions = np.exp(self.holder.predictor.predict(X))
+        return axes, predictions.reshape([len(axis) for axis in axes])
+
+class RemotePredictionClient:
+    """Call the prediction API over a pooled keep-alive session with timeouts and retries"""
+
+    mode = 'remote'
+
+    def __init__(self, base_url=None, timeout=None, retries=None, pool_size=None):
+        self.base_url = (base_url or Config.API_BASE_URL).rstrip('/')
+        self.timeout = timeout or Config.API_TIMEOUT
+        retry = Retry(
+            total=Config.API_RETRIES if retries is None else retries,
+            backoff_factor=0.1,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({'GET', 'POST'}),  # predictions are idempotent
+            raise_on_status=False
+        )
+        pool_size = pool_size or Config.API_POOL_SIZE
+        self.session = requests.Session()
+        self.session.mount(
+            self.base_url,
+            HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        )
+
+    def _post(self, path, payload):
+        try:
+            response = self.session.post(f"{self.base_url}{path}", json=payload, timeout=self.timeout)
+        except requests.exceptions.ConnectionError as e:
+            logger.error(f"Cannot reach prediction API at {self.base_url}: {str(e)}")
+            raise PredictionError(
+                "Error connecting to the prediction service. Please make sure the API is running."
+            ) from e
+        except requests.exceptions.Timeout as e:
+            raise PredictionError("The prediction service did not respond in time.") from e
+
+        if response.status_code != 200:
+            try:
+                detail = response.json().get('detail', response.text)
+            except ValueError:
+                detail = response.text
+            raise PredictionError(f"Error making prediction: {detail}")
+        return response.json()
+
+    def predict(self, features):
+        """Price for a dict of feature values"""
+        return self._post("/predict", features)["prediction"]
+
+    def predict_batch(self, X):
+        """Prices for an (n_rows, n_features) array ordered by Config.FEATURE_COLUMNS, NaN for invalid rows"""
+        X = np.asarray(X, dtype=np.float64).reshape(-1, len(Config.FEATURE_COLUMNS))
+        columns = {feature: X[:, i].tolist() for i, feature in enumerate(Config.FEATURE_COLUMNS)}
+        predictions = self._post("/predict/batch", {"columns": columns})["predictions"]
+        return np.array([np.nan if p is None else p for p in predictions], dtype=np.float64)
+
+    def sweep(self, features, vary, points=None):
+        """(axes, predictions) varying one or two features of a dict of feature values across their range"""
+        payload = {"base": features, "features": list(vary)}
+        if points is not None:
+            payload["points"] = points
+        result = self._post("/predict/sweep", payload)
+        return [np.asarray(axis) for axis in result["axes"]], np.asarray(result["predictions"])
+
+PREDICTION_CLIENTS = {
+    'local': LocalPredictionClient,
+    'remote': RemotePredictionClient
+}
+
+def get_prediction_client(mode=None):
+    """Prediction client for Config.PREDICTION_CLIENT_MODE ("local" or "remote")"""
+    mode = mode or Config.PREDICTION_CLIENT_MODE
+    if mode not in PREDICTION_CLIENTS:
+        raise ValueError(f"Unknown prediction client mode: {mode}. Choose from {sorted(PREDICTION_CLIENTS)}")
+    return PREDICTION_CLIENTS[mode]()
@@ -1,9 +1,9 @@
-import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 import pickle
 from config.config import Config
+from src.dataset import load_dataset
 from utils.logger import setup_logger
 
 logger = setup_logger('data_preparation')
@@ -12,12 +12,12 @@ def load_and_prepare_data():
     """Load and prepare data for modeling"""
     try:
         # Load data
-        logger.info("Loading data from CSV...")
-        df = pd.read_csv(Config.DATA_PATH)
+        logger.info("Loading data from columnar cache...")
+        df = load_dataset()
         
         # Split features and target
-        X = df[Config.FEATURE_COLUMNS]
-        y = np.log(df[Config.TARGET_COLUMN])
+        X = df[Config.FEATURE_COLUMNS].astype(np.float64)
+        y = np.log(df[Config.TARGET_COLUMN].astype(np.float64))
         
         # Save feature names
         feature_names = X.columns.tolist()
@@ -0,0 +1,108 @@
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from config.config import Config
+from src.cache import file_digest, hash_payload
+from utils.logger import setup_logger
+
+logger = setup_logger('dataset')
+
+DATASET_FORMAT_VERSION = 1
+
+_lock = threading.Lock()
+_loaded = {}
+
+def _column_array(series):
+    """Compact array for one column: float32 floats, smallest integer type, fixed-width strings"""
+    if pd.api.types.is_bool_dtype(series):
+        return series.to_numpy(dtype=np.bool_)
+    if pd.api.types.is_integer_dtype(series):
+        return pd.to_numeric(series, downcast='integer').to_numpy()
+    if pd.api.types.is_float_dtype(series):
+        return series.to_numpy(dtype=Config.DATASET_FLOAT_DTYPE)
+    return series.astype(str).to_numpy(dtype=str)
+
+def _cache_dir(path):
+    return Config.DATASET_CACHE_DIR / f"{path.stem}-{hash_payload(str(path.resolve()))[:8]}"
+
+def _read_manifest(cache_dir):
+    try:
+        with open(cache_dir / "manifest.json") as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    return manifest if manifest.get('format_version') == DATASET_FORMAT_VERSION else None
+
+def _write_manifest(cache_dir, manifest):
+    tmp_path = cache_dir / "manifest.json.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=4)
+    os.replace(tmp_path, cache_dir / "manifest.json")
+
+def convert_dataset(path, cache_dir, stat, digest):
+    """Parse the CSV once and write one .npy file per column next to a manifest"""
+    df = pd.read_csv(path)
+    staging_dir = cache_dir.with_name(f".{cache_dir.name}.{os.getpid()}.tmp")
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    staging_dir.mkdir(parents=True)
+
+    columns = {}
+    for index, name in enumerate(df.columns):
+        array = _column_array(df[name])
+        file_name = f"{index:03d}.npy"
+        np.save(staging_dir / file_name, array)
+        columns[name] = {'file': file_name, 'dtype': array.dtype.str}
+
+    _write_manifest(staging_dir, {
+        'format_version': DATASET_FORMAT_VERSION,
+        'source': str(path),
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'sha256': digest,
+        'rows': len(df),
+        'columns': columns
+    })
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    os.replace(staging_dir, cache_dir)
+    logger.info(f"Converted {path} to columnar cache ({len(df)} rows, {len(columns)} columns)")
+
+def _ensure_converted(path):
+    """Manifest of an up-to-date cache for path, re-converting only when the content hash changed"""
+    cache_dir = _cache_dir(path)
+    stat = os.stat(path)
+    manifest = _read_manifest(cache_dir)
+    if manifest is not None and (manifest['mtime_ns'], manifest['size']) == (stat.st_mtime_ns, stat.st_size):
+        return cache_dir, manifest
+
+    digest = file_digest(path)
+    if manifest is not None and manifest['sha256'] == digest:
+        manifest.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+        _write_manifest(cache_dir, manifest)
+        return cache_dir, manifest
+
+    convert_dataset(path, cache_dir, stat, digest)
+    return cache_dir, _read_manifest(cache_dir)
+
+def dataset_manifest(path=None):
+    """(cache directory, manifest) of the up-to-date columnar cache of a dataset"""
+    path = Path(Config.DATA_PATH if path is None else path)
+    with _lock:
+        return _ensure_converted(path)
+
+def load_dataset(path=None, columns=None):
+    """Load a CSV dataset as a DataFrame of read-only memory-mapped columns, shared within the process"""
+    path = Path(Config.DATA_PATH if path is None else path)
+    with _lock:
+        cache_dir, manifest = _ensure_converted(path)
+        digest, df = _loaded.get(path, (None, None))
+        if digest != manifest['sha256']:
+            df = pd.DataFrame({
+                name: np.load(cache_dir / column['file'], mmap_mode='r')
+                for name, column in manifest['columns'].items()
+            }, copy=False)
+            _loaded[path] = (manifest['sha256'], df)
+    return df if columns is None else df[columns]
@@ -0,0 +1,72 @@
+import io
+import numpy as np
+from config.config import Config
+
+class PredictionHistory:
+    """Fixed-capacity ring buffer of predictions with running statistics since the last clear"""
+
+    def __init__(self, capacity=None, features=None):
+        self.capacity = capacity or Config.PREDICTION_HISTORY_SIZE
+        self.features = list(Config.FEATURE_COLUMNS if features is None else features)
+        self._values = np.empty((self.capacity, len(self.features)), dtype=np.float64)
+        self._prices = np.empty(self.capacity, dtype=np.float64)
+        self.clear()
+
+    def clear(self):
+        self._next = 0
+        self._size = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = float('-inf')
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else float('nan')
+
+    def append(self, features, price):
+        """Record one prediction from a dict of feature values"""
+        self._values[self._next] = [features[feature] for feature in self.features]
+        self._prices[self._next] = price
+        self._next = (self._next + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+        self.count += 1
+        self.total += price
+        self.min = min(self.min, price)
+        self.max = max(self.max, price)
+
+    def _order(self):
+        """Buffer positions from oldest to newest"""
+        start = (self._next - self._size) % self.capacity
+        return (start + np.arange(self._size)) % self.capacity
+
+    def recent(self, n):
+        """Up to n latest predictions as dicts, newest first, each with its 1-based prediction number"""
+        order = self._order()[::-1][:n]
+        return [
+            {
+                'number': self.count - i,
+                'prediction': float(self._prices[pos]),
+                **dict(zip(self.features, self._values[pos].tolist()))
+            }
+            for i, pos in enumerate(order.tolist())
+        ]
+
+    def column(self, name):
+        """Values of a feature (or 'prediction') in the buffer, oldest first"""
+        order = self._order()
+        if name == 'prediction':
+            return self._prices[order]
+        return self._values[order, self.features.index(name)]
+
+    def to_csv(self):
+        """Buffered predictions as UTF-8 CSV bytes, oldest first"""
+        order = self._order()
+        table = np.column_stack([self._prices[order], self._values[order]])
+        buffer = io.StringIO()
+        np.savetxt(buffer, table, delimiter=',', fmt='%.10g', header=','.join(['prediction'] + self.features), comments='')
+        return buffer.getvalue().encode('utf-8')
@@ -0,0 +1,137 @@
+import pickle
+import threading
+from functools import partial
+import numpy as np
+from config.config import Config
+from src.tree_engine import CompiledPredictor
+from utils.logger import setup_logger
+
+logger = setup_logger('inference')
+
+def scaler_arrays(scaler):
+    """(mean, scale) of a fitted StandardScaler, identity where disabled"""
+    n_features = len(Config.FEATURE_COLUMNS)
+    mean = np.asarray(scaler.mean_, dtype=np.float64) if scaler.with_mean else np.zeros(n_features)
+    scale = np.asarray(scaler.scale_, dtype=np.float64) if scaler.with_std else np.ones(n_features)
+    return mean, scale
+
+def pipeline_iteration_range(model):
+    """Boosting rounds XGBRegressor.predict uses for the pipeline's regressor"""
+    try:
+        return (0, model.named_steps['regressor'].best_iteration + 1)
+    except AttributeError:
+        return (0, 0)
+
+class FastPredictor:
+    """Precompiled inference path for the scaler + XGBoost pipeline; predict_row is not thread-safe"""
+
+    def __init__(self, booster, mean, scale, iteration_range=(0, 0), missing=np.nan):
+        n_features = len(Config.FEATURE_COLUMNS)
+        self.booster = booster
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.iteration_range = tuple(iteration_range)
+        self.missing = missing
+
+        self._row = np.empty((1, n_features), dtype=np.float64)
+        self._row32 = np.empty((1, n_features), dtype=np.float32)
+
+    @classmethod
+    def from_pipeline(cls, model, scaler):
+        """Build from the fitted scaler and pipeline"""
+        mean, scale = scaler_arrays(scaler)
+        regressor = model.named_steps['regressor']
+        return cls(
+            regressor.get_booster(), mean, scale,
+            iteration_range=pipeline_iteration_range(model),
+            missing=regressor.missing
+        )
+
+    def _inplace_predict(self, X32):
+        return self.booster.inplace_predict(
+            X32,
+            iteration_range=self.iteration_range,
+            predict_type="value",
+            missing=self.missing,
+            validate_features=False
+        )
+
+    def predict(self, X):
+        """Predict log prices for an (n_rows, n_features) array ordered by Config.FEATURE_COLUMNS"""
+        X = np.array(X, dtype=np.float64).reshape(-1, len(Config.FEATURE_COLUMNS))
+        X -= self.mean
+        X /= self.scale
+        return self._inplace_predict(np.ascontiguousarray(X, dtype=np.float32))
+
+    def predict_row(self, values):
+        """Predict the log price for a single row of feature values"""
+        row = self._row
+        row[0] = values
+        np.subtract(row, self.mean, out=row)
+        np.divide(row, self.scale, out=row)
+        self._row32[...] = row
+        return self._inplace_predict(self._row32)[0]
+
+class HybridPredictor:
+    """Compiled engine for single rows and small batches, native booster (loaded on first use) for larger ones"""
+
+    def __init__(self, compiled, load_native, max_compiled_rows=None):
+        self.compiled = compiled
+        self.max_compiled_rows = Config.COMPILED_MAX_ROWS if max_compiled_rows is None else max_compiled_rows
+        self._load_native = load_native
+        self._native = None
+        self._native_lock = threading.Lock()
+
+    @property
+    def native(self):
+        if self._native is None:
+            with self._native_lock:
+                if self._native is None:
+                    self._native = self._load_native()
+        return self._native
+
+    def warm_up(self):
+        """Load the native booster now instead of on the first large batch"""
+        return self.native
+
+    def predict(self, X):
+        """Predict log prices for an (n_rows, n_features) array ordered by Config.FEATURE_COLUMNS"""
+        X = np.asarray(X, dtype=np.float64).reshape(-1, len(Config.FEATURE_COLUMNS))
+        if len(X) <= self.max_compiled_rows:
+            return self.compiled.predict(X)
+        return self.native.predict(X)
+
+    def predict_row(self, values):
+        """Predict the log price for a single row of feature values"""
+        return self.compiled.predict_row(values)
+
+def _load_native_or_pickle(native_path, model_path, scaler_path):
+    if native_path.exists():
+        # Native booster + NumPy scaler bundle, no pickle involved
+        from src.artifacts import load_native_predictor
+        predictor = load_native_predictor(native_path)
+        logger.info("Native model loaded successfully")
+        return predictor
+
+    with open(model_path, 'rb') as f:
+        model = pickle.load(f)
+    with open(scaler_path, 'rb') as f:
+        scaler = pickle.load(f)
+    predictor = FastPredictor.from_pipeline(model, scaler)
+    logger.info("Model and scaler loaded successfully")
+    return predictor
+
+def load_serving_predictor(artifacts_dir=None):
+    """Load the predictor of a registry version or Config.ARTIFACTS_DIR, hybrid when a compiled export exists"""
+    paths = (Config.COMPILED_MODEL_PATH, Config.NATIVE_MODEL_PATH, Config.MODEL_PATH, Config.SCALER_PATH)
+    if artifacts_dir is not None:
+        paths = tuple(artifacts_dir / path.name for path in paths)
+    compiled_path, native_path, model_path, scaler_path = paths
+    load_native = partial(_load_native_or_pickle, native_path, model_path, scaler_path)
+
+    if compiled_path.exists():
+        # Compiled tree engine only needs NumPy: no sklearn/xgboost import until the first large batch
+        predictor = HybridPredictor(CompiledPredictor.load(compiled_path), load_native)
+        logger.info("Compiled model loaded successfully")
+        return predictor
+    return load_native()
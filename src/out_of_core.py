@@ -0,0 +1,181 @@
+import json
+import pickle
+import shutil
+import numpy as np
+import pandas as pd
+import xgboost
+from sklearn.base import clone
+from sklearn.preprocessing import StandardScaler
+from config.config import Config
+from src.inference import scaler_arrays
+from utils.logger import setup_logger
+
+logger = setup_logger('out_of_core')
+
+# Hash buckets for the train/test split; a row is in the test set if its bucket < TEST_SIZE * SPLIT_BUCKETS
+SPLIT_BUCKETS = 10000
+
+def test_rows(chunk):
+    """Deterministic test-set membership of each row, from a hash of its content"""
+    hashes = pd.util.hash_pandas_object(
+        chunk, index=False, hash_key=f"{Config.RANDOM_STATE:016d}"
+    ).to_numpy()
+    return hashes % SPLIT_BUCKETS < Config.TEST_SIZE * SPLIT_BUCKETS
+
+def _shard_paths(directory, index):
+    return directory / f"X_{index:05d}.npy", directory / f"y_{index:05d}.npy"
+
+def list_shards(directory):
+    """(X, y) paths of the shards in a split directory, in write order"""
+    return [_shard_paths(directory, int(path.stem[2:])) for path in sorted(directory.glob("X_*.npy"))]
+
+def prepare_out_of_core_data(path=None, chunk_size=None, out_dir=None):
+    """Split a CSV into train/test shards on disk and fit the scaler, in one pass"""
+    path = path or Config.DATA_PATH
+    chunk_size = chunk_size or Config.OUT_OF_CORE_CHUNK_SIZE
+    out_dir = out_dir or Config.OUT_OF_CORE_DIR
+    split_dirs = {'train': out_dir / "train", 'test': out_dir / "test"}
+    for directory in split_dirs.values():
+        shutil.rmtree(directory, ignore_errors=True)
+        directory.mkdir(parents=True)
+
+    scaler = StandardScaler()
+    counts = {'train': 0, 'test': 0}
+    columns = Config.FEATURE_COLUMNS + [Config.TARGET_COLUMN]
+    chunks = pd.read_csv(path, chunksize=chunk_size, usecols=columns, dtype=np.float64)
+    for index, chunk in enumerate(chunks):
+        chunk = chunk[columns]
+        is_test = test_rows(chunk)
+        X = chunk[Config.FEATURE_COLUMNS].to_numpy()
+        y = np.log(chunk[Config.TARGET_COLUMN].to_numpy())
+
+        for split, mask in (('train', ~is_test), ('test', is_test)):
+            if not mask.any():
+                continue
+            X_path, y_path = _shard_paths(split_dirs[split], index)
+            np.save(X_path, X[mask])
+            np.save(y_path, y[mask])
+            counts[split] += int(mask.sum())
+        if (~is_test).any():
+            scaler.partial_fit(X[~is_test])
+
+    if counts['train'] == 0:
+        raise ValueError(f"No training rows in {path}")
+
+    with open(Config.SCALER_PATH, 'wb') as f:
+        pickle.dump(scaler, f)
+
+    logger.info(f"Prepared {counts['train']} train / {counts['test']} test rows from {path} in shards of {chunk_size}")
+    return list_shards(split_dirs['train']), list_shards(split_dirs['test']), scaler
+
+def shard_rows(shards):
+    return sum(len(np.load(X_path, mmap_mode='r')) for X_path, _ in shards)
+
+def iter_scaled_shards(shards, scaler):
+    """Yield (scaled X, y) for each shard, memory-mapped and scaled one shard at a time"""
+    mean, scale = scaler_arrays(scaler)
+    for X_path, y_path in shards:
+        X = np.load(X_path, mmap_mode='r')
+        yield (X - mean) / scale, np.load(y_path)
+
+class ShardIter(xgboost.DataIter):
+    """Feed scaled shards to XGBoost one at a time"""
+
+    def __init__(self, shards, scaler, cache_prefix=None):
+        self.shards = shards
+        self.scaler = scaler
+        self._batches = None
+        super().__init__(cache_prefix=cache_prefix)
+
+    def next(self, input_data):
+        if self._batches is None:
+            self._batches = iter_scaled_shards(self.shards, self.scaler)
+        try:
+            X, y = next(self._batches)
+        except StopIteration:
+            return False
+        input_data(data=X, label=y)
+        return True
+
+    def reset(self):
+        self._batches = None
+
+def train_out_of_core(train_shards, scaler, pipeline, external_memory=None):
+    """Train the pipeline's regressor on the shards through an XGBoost DataIter"""
+    external_memory = Config.OUT_OF_CORE_EXTERNAL_MEMORY if external_memory is None else external_memory
+    pipeline = clone(pipeline).set_params(**Config.OUT_OF_CORE_PARAMS)
+    regressor = pipeline.named_steps['regressor']
+    params = {key: value for key, value in regressor.get_xgb_params().items() if value is not None}
+    params['tree_method'] = 'hist'
+
+    if external_memory:
+        cache_prefix = str(Config.OUT_OF_CORE_DIR / "xgb_cache")
+        dtrain = xgboost.DMatrix(ShardIter(train_shards, scaler, cache_prefix=cache_prefix))
+    else:
+        dtrain = xgboost.QuantileDMatrix(ShardIter(train_shards, scaler), max_bin=params.get('max_bin', 256))
+
+    logger.info(
+        f"Training on {dtrain.num_row()} rows "
+        f"({'external memory' if external_memory else 'in-memory QuantileDMatrix'})"
+    )
+    booster = xgboost.train(params, dtrain, num_boost_round=regressor.n_estimators)
+
+    # Wrap the booster in the sklearn estimator so serving and exports see a normal pipeline
+    regressor.load_model(booster.save_raw('ubj'))
+    with open(Config.MODEL_PATH, 'wb') as f:
+        pickle.dump(pipeline, f)
+    return pipeline
+
+class _StreamingMetrics:
+    """Running sums for R2 on the log target and RMSE/MAE on prices"""
+
+    def __init__(self):
+        self.n = 0
+        self.sum_y = self.sum_y2 = self.sse = self.price_se = self.price_ae = 0.0
+
+    def update(self, y, pred):
+        self.n += len(y)
+        self.sum_y += float(y.sum())
+        self.sum_y2 += float(np.square(y).sum())
+        self.sse += float(np.square(y - pred).sum())
+        price_error = np.exp(y) - np.exp(pred)
+        self.price_se += float(np.square(price_error).sum())
+        self.price_ae += float(np.abs(price_error).sum())
+
+    def result(self):
+        sst = self.sum_y2 - self.sum_y ** 2 / self.n
+        return {
+            'r2': 1.0 - self.sse / sst if sst > 0 else 0.0,
+            'rmse': float(np.sqrt(self.price_se / self.n)),
+            'mae': self.price_ae / self.n
+        }
+
+def evaluate_out_of_core(model, train_shards, test_shards, scaler, feature_names):
+    """evaluate_model over shards: same metrics and output files, one shard in memory at a time"""
+    metrics = {}
+    for split, shards in (('train', train_shards), ('test', test_shards)):
+        running = _StreamingMetrics()
+        for X, y in iter_scaled_shards(shards, scaler):
+            running.update(y, model.predict(X))
+        if running.n:
+            metrics.update({f"{split}_{name}": value for name, value in running.result().items()})
+
+    importance_values = [float(x) for x in model.named_steps['regressor'].feature_importances_]
+    feature_importance = dict(zip(feature_names, importance_values))
+
+    with open(Config.METRICS_PATH, 'w') as f:
+        json.dump(metrics, f, indent=4)
+    with open(Config.FEATURE_IMPORTANCE_PATH, 'w') as f:
+        json.dump(feature_importance, f, indent=4)
+
+    logger.info("Out-of-core evaluation completed and saved")
+    return metrics, feature_importance
+
+def parity_rows(shards, n_rows=1000):
+    """Raw feature rows from the first shards, for export parity checks"""
+    rows = []
+    for X_path, _ in shards:
+        rows.append(np.load(X_path, mmap_mode='r')[:n_rows - sum(len(r) for r in rows)])
+        if sum(len(r) for r in rows) >= n_rows:
+            break
+    return np.concatenate(rows)
@@ -0,0 +1,84 @@
+import math
+import numpy as np
+
+def box_stats(values):
+    """Tukey box of a 1-D array: quartiles and whiskers at the most extreme values within 1.5 IQR"""
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return None
+    q1, median, q3 = (float(q) for q in np.quantile(values, (0.25, 0.5, 0.75)))
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    return {
+        'count': int(len(values)),
+        'q1': q1,
+        'median': median,
+        'q3': q3,
+        'lower_fence': float(inside.min()),
+        'upper_fence': float(inside.max()),
+        'outliers': int(len(values) - len(inside))
+    }
+
+def nice_edges(low, high, max_bins=10):
+    """Bin edges on a round step (1, 2 or 5 x 10^k) covering [low, high] in at most max_bins bins"""
+    if not np.isfinite(low) or not np.isfinite(high) or high <= low:
+        return np.array([low, low + 1.0])
+    raw_step = (high - low) / max_bins
+    magnitude = 10 ** math.floor(math.log10(raw_step))
+    step = next(m * magnitude for m in (1, 2, 5, 10) if m * magnitude >= raw_step)
+    start = math.floor(low / step) * step
+    n_bins = max(1, math.ceil((high - start) / step - 1e-9))
+    return start + step * np.arange(n_bins + 1)
+
+def _format_edge(value):
+    return f"{value:g}"
+
+def binned_box_stats(x, y, edges):
+    """Box statistics of y for each non-empty bin of x, e.g. prices per room-count range"""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    bins = np.clip(np.searchsorted(edges, x, side='right') - 1, 0, len(edges) - 2)
+    keep = ~np.isnan(x) & ~np.isnan(y)
+    bins, y = bins[keep], y[keep]
+
+    order = np.argsort(bins, kind='stable')
+    bins, y = bins[order], y[order]
+    starts = np.searchsorted(bins, np.arange(len(edges)))
+
+    groups = []
+    for i in range(len(edges) - 1):
+        stats = box_stats(y[starts[i]:starts[i + 1]])
+        if stats is not None:
+            groups.append({'label': f"{_format_edge(edges[i])}-{_format_edge(edges[i + 1])}", **stats})
+    return groups
+
+def stratified_sample(values, n_points, n_strata=10, seed=0):
+    """Sorted indices of up to n_points rows spread evenly over quantile strata of values"""
+    values = np.asarray(values, dtype=np.float64)
+    n_rows = len(values)
+    if n_rows <= n_points:
+        return np.arange(n_rows)
+
+    rng = np.random.default_rng(seed)
+    edges = np.unique(np.nanquantile(values, np.linspace(0, 1, n_strata + 1)))
+    strata = np.clip(np.searchsorted(edges, values, side='right') - 1, 0, max(len(edges) - 2, 0))
+    members = [np.flatnonzero(strata == s) for s in range(max(len(edges) - 1, 1))]
+    members = [m for m in members if len(m)]
+
+    # Equal share per stratum; what small strata cannot use goes to the others
+    quotas = np.zeros(len(members), dtype=int)
+    remaining = n_points
+    open_strata = list(range(len(members)))
+    while remaining > 0 and open_strata:
+        share = max(1, remaining // len(open_strata))
+        for s in list(open_strata):
+            take = min(share, len(members[s]) - quotas[s], remaining)
+            quotas[s] += take
+            remaining -= take
+            if quotas[s] == len(members[s]):
+                open_strata.remove(s)
+            if remaining == 0:
+                break
+
+    picked = [rng.choice(m, size=q, replace=False) for m, q in zip(members, quotas) if q]
+    return np.sort(np.concatenate(picked))
@@ -0,0 +1,60 @@
+import threading
+import time
+from collections import OrderedDict
+from config.config import Config
+
+class PredictionCache:
+    """Bounded LRU cache of predictions with a per-entry TTL, keyed by model version and exact feature values"""
+
+    def __init__(self, maxsize=None, ttl=None, clock=time.monotonic):
+        self.maxsize = Config.PREDICTION_CACHE_SIZE if maxsize is None else maxsize
+        self.ttl = Config.CACHE_TTL if ttl is None else ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, version, values):
+        """Cache key for a feature vector ordered by Config.FEATURE_COLUMNS"""
+        # Exact values: a rounded key would serve the prediction of whichever nearby input came first
+        return (version,) + tuple(float(value) for value in values)
+
+    def get(self, key):
+        """Return the cached prediction for key, or None on a miss or expired entry"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= self.clock():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, self.clock() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl
+            }
@@ -0,0 +1,160 @@
+import os
+import shutil
+import threading
+from datetime import datetime
+from config.config import Config
+from src.cache import file_digest
+from src.inference import HybridPredictor, load_serving_predictor
+from utils.logger import setup_logger
+
+logger = setup_logger('registry')
+
+class ModelRegistry:
+    """Versioned copies of the serving artifacts under Config.MODEL_REGISTRY_DIR"""
+
+    ARTIFACTS = ('MODEL_PATH', 'SCALER_PATH', 'COMPILED_MODEL_PATH', 'NATIVE_MODEL_PATH',
+                 'METRICS_PATH', 'FEATURE_IMPORTANCE_PATH')
+
+    def __init__(self, root=None):
+        self.root = root or Config.MODEL_REGISTRY_DIR
+        self.current_path = self.root / "CURRENT"
+
+    def list_versions(self):
+        """Published versions, oldest first"""
+        if not self.root.exists():
+            return []
+        return sorted(p.name for p in self.root.iterdir() if p.is_dir() and not p.name.startswith('.'))
+
+    def current_version(self):
+        """Name of the version to serve, or None if nothing is published"""
+        try:
+            with open(self.current_path) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def version_dir(self, version):
+        return self.root / version
+
+    def publish(self):
+        """Copy the current artifacts into a new version and make it current"""
+        version = f"{datetime.now():%Y%m%d%H%M%S}-{file_digest(Config.MODEL_PATH)[:8]}"
+        staging_dir = self.root / f".{version}.tmp"
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        staging_dir.mkdir(parents=True)
+
+        for name in self.ARTIFACTS:
+            path = getattr(Config, name)
+            if path.is_dir():
+                shutil.copytree(path, staging_dir / path.name)
+            elif path.exists():
+                shutil.copy2(path, staging_dir / path.name)
+
+        os.replace(staging_dir, self.version_dir(version))
+        self.set_current(version)
+        self.prune()
+        logger.info(f"Published model version {version}")
+        return version
+
+    def set_current(self, version):
+        """Atomically point CURRENT at an existing version"""
+        if not self.version_dir(version).is_dir():
+            raise ValueError(f"Unknown model version: {version}")
+        tmp_path = self.root / ".CURRENT.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(version)
+        os.replace(tmp_path, self.current_path)
+
+    def prune(self, keep=None):
+        """Delete the oldest versions, never the current one"""
+        keep = keep or Config.MODEL_REGISTRY_KEEP
+        current = self.current_version()
+        for version in self.list_versions()[:-keep]:
+            if version != current:
+                shutil.rmtree(self.version_dir(version), ignore_errors=True)
+
+    def load(self, version):
+        """Load the serving predictor of a version"""
+        return load_serving_predictor(self.version_dir(version))
+
+class ModelHolder:
+    """Holds the (version, predictor) being served and swaps it atomically"""
+
+    UNVERSIONED = "unversioned"
+
+    def __init__(self, registry=None):
+        self.registry = registry or ModelRegistry()
+        self.current = None
+        self._reload_lock = threading.Lock()
+        self._watcher = None
+        self._stop = threading.Event()
+
+    @property
+    def version(self):
+        return self.current[0]
+
+    @property
+    def predictor(self):
+        return self.current[1]
+
+    def load(self):
+        """Load the current registry version, or the plain artifacts if none is published"""
+        version = self.registry.current_version()
+        if version is None:
+            self.current = (self.UNVERSIONED, load_serving_predictor())
+        else:
+            self.current = (version, self.registry.load(version))
+        logger.info(f"Serving model version {self.version}")
+        return self.version
+
+    def reload(self, version=None):
+        """Load a version (default: registry CURRENT), then make it CURRENT and swap it in"""
+        with self._reload_lock:
+            target = version or self.registry.current_version()
+            if target is None:
+                return self.version
+            # Load before touching CURRENT, so a broken version is never advertised to other workers
+            predictor = self.registry.load(target) if target != self.version else None
+            if predictor is not None:
+                self._warm_up(predictor)
+            if version is not None and version != self.registry.current_version():
+                self.registry.set_current(version)
+            if predictor is None:
+                return self.version
+            previous = self.version
+            self.current = (target, predictor)
+            logger.info(f"Swapped model version {previous} -> {target}")
+            return target
+
+    def _warm_up(self, predictor):
+        if isinstance(predictor, HybridPredictor):
+            try:
+                predictor.warm_up()
+            except Exception as e:
+                # Single rows still work; large batches retry the native load
+                logger.error(f"Error loading native model: {str(e)}")
+
+    def warm_up(self):
+        """Load the deferred native booster of the served predictor"""
+        self._warm_up(self.predictor)
+
+    def _watch(self, interval):
+        while not self._stop.wait(interval):
+            try:
+                self.reload()
+            except Exception as e:
+                logger.error(f"Error reloading model: {str(e)}")
+
+    def start_watcher(self, interval=None):
+        """Poll the registry CURRENT pointer in a background thread"""
+        interval = interval or Config.MODEL_WATCH_INTERVAL
+        if interval and self._watcher is None:
+            self._stop.clear()
+            self._watcher = threading.Thread(target=self._watch, args=(interval,), daemon=True)
+            self._watcher.start()
+
+    def stop_watcher(self):
+        if self._watcher is not None:
+            self._stop.set()
+            self._watcher.join()
+            self._watcher = None
@@ -0,0 +1,163 @@
+import math
+import os
+import time
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.metrics import r2_score
+from sklearn.model_selection import KFold, ParameterGrid
+from config.config import Config
+from utils.logger import setup_logger
+
+logger = setup_logger('search')
+
+def thread_budget(n_jobs=None):
+    """(outer, inner) split of the cores between parallel trials and XGBoost threads"""
+    n_cpus = os.cpu_count() or 1
+    outer = n_cpus if n_jobs in (None, -1) else max(1, min(n_jobs, n_cpus))
+    inner = max(1, n_cpus // outer)
+    return outer, inner
+
+def budget_params(pipeline, params, fraction):
+    """Scale the number of boosting rounds of a candidate by fraction"""
+    n_estimators = params.get(
+        'regressor__n_estimators',
+        pipeline.get_params()['regressor__n_estimators']
+    )
+    return {**params, 'regressor__n_estimators': max(1, int(round(n_estimators * fraction)))}
+
+def _fit_and_score(pipeline, params, X, y, train_idx, test_idx):
+    """Fit one candidate on one fold and return (r2 score, fit seconds)"""
+    estimator = clone(pipeline).set_params(**params)
+    start = time.perf_counter()
+    estimator.fit(X[train_idx], y[train_idx])
+    fit_time = time.perf_counter() - start
+    score = r2_score(y[test_idx], estimator.predict(X[test_idx]))
+    return float(score), fit_time
+
+class GridSearchEngine:
+    """Exhaustive search, every candidate evaluated with the full budget"""
+
+    name = 'grid'
+
+    def __init__(self, n_jobs=None, cv=None, fold_cache=None):
+        self.n_jobs, self.inner_jobs = thread_budget(Config.SEARCH_N_JOBS if n_jobs is None else n_jobs)
+        self.cv = cv or KFold(n_splits=Config.CV_FOLDS)
+        self.fold_cache = fold_cache
+
+    def _evaluate(self, pipeline, candidates, X, y, fraction=1.0):
+        """Cross-validate candidates at the given budget fraction, one trial per candidate"""
+        folds = list(self.cv.split(X, y))
+        fit_params = [
+            {**budget_params(pipeline, params, fraction), 'regressor__n_jobs': self.inner_jobs}
+            for params in candidates
+        ]
+        tasks = [(params, fold) for params in fit_params for fold in range(len(folds))]
+
+        # Reuse cached fold results, only fit the rest
+        results = [None] * len(tasks)
+        keys = [None] * len(tasks)
+        if self.fold_cache is not None:
+            for i, (params, fold) in enumerate(tasks):
+                keys[i] = self.fold_cache.key(pipeline, params, fold)
+                results[i] = self.fold_cache.get(keys[i])
+        pending = [i for i, result in enumerate(results) if result is None]
+
+        fitted = Parallel(n_jobs=self.n_jobs)(
+            delayed(_fit_and_score)(pipeline, tasks[i][0], X, y, *folds[tasks[i][1]])
+            for i in pending
+        )
+        for i, result in zip(pending, fitted):
+            results[i] = result
+            if self.fold_cache is not None:
+                self.fold_cache.set(keys[i], result)
+        if self.fold_cache is not None and pending:
+            self.fold_cache.save()
+
+        pending = set(pending)
+        trials = []
+        for i, params in enumerate(candidates):
+            task_ids = range(i * len(folds), (i + 1) * len(folds))
+            fold_scores = [results[t][0] for t in task_ids]
+            trials.append({
+                'params': params,
+                'budget': fraction,
+                'n_estimators': fit_params[i]['regressor__n_estimators'],
+                'fold_scores': fold_scores,
+                'mean_score': float(np.mean(fold_scores)),
+                # Time spent fitting in this run; folds served from the cache cost nothing
+                'fit_time': float(sum(results[t][1] for t in task_ids if t in pending)),
+                'cached_folds': sum(t not in pending for t in task_ids)
+            })
+        return trials
+
+    def _run(self, pipeline, candidates, X, y):
+        """Return (trials the best candidate is chosen from, trials of earlier rungs)"""
+        return self._evaluate(pipeline, candidates, X, y), []
+
+    def search(self, pipeline, param_grid, X, y):
+        """Search param_grid and return best params, best score and per-trial results"""
+        X = np.asarray(X)
+        y = np.asarray(y)
+        candidates = list(ParameterGrid(param_grid))
+        logger.info(
+            f"{self.name} search over {len(candidates)} candidates x {self.cv.get_n_splits()} folds "
+            f"({self.n_jobs} parallel trials x {self.inner_jobs} XGBoost threads)"
+        )
+
+        start = time.perf_counter()
+        final_trials, trials = self._run(pipeline, candidates, X, y)
+        wall_time = time.perf_counter() - start
+
+        best = max(final_trials, key=lambda trial: trial['mean_score'])
+        return {
+            'best_params': best['params'],
+            'best_score': best['mean_score'],
+            'trials': trials + final_trials,
+            'wall_time': wall_time
+        }
+
+class HalvingSearchEngine(GridSearchEngine):
+    """Successive halving over boosting rounds, promoting the best 1/factor of candidates per rung"""
+
+    name = 'halving'
+
+    def __init__(self, n_jobs=None, cv=None, fold_cache=None, factor=None, min_fraction=None):
+        super().__init__(n_jobs=n_jobs, cv=cv, fold_cache=fold_cache)
+        self.factor = factor or Config.HALVING_FACTOR
+        self.min_fraction = min_fraction or Config.HALVING_MIN_FRACTION
+
+    def _run(self, pipeline, candidates, X, y):
+        n_rungs = max(1, min(
+            math.ceil(math.log(max(len(candidates), 1)) / math.log(self.factor)),
+            math.floor(math.log(1 / self.min_fraction) / math.log(self.factor)) + 1
+        ))
+
+        earlier_trials = []
+        for rung in range(n_rungs):
+            fraction = float(self.factor) ** (rung - (n_rungs - 1))
+            rung_start = time.perf_counter()
+            trials = self._evaluate(pipeline, candidates, X, y, fraction)
+            logger.info(
+                f"Rung {rung + 1}/{n_rungs}: {len(candidates)} candidates at {fraction:.0%} budget "
+                f"in {time.perf_counter() - rung_start:.1f}s"
+            )
+            if rung == n_rungs - 1:
+                return trials, earlier_trials
+
+            trials.sort(key=lambda trial: trial['mean_score'], reverse=True)
+            n_keep = max(1, math.ceil(len(trials) / self.factor))
+            earlier_trials.extend(trials)
+            candidates = [trial['params'] for trial in trials[:n_keep]]
+
+SEARCH_ENGINES = {
+    GridSearchEngine.name: GridSearchEngine,
+    HalvingSearchEngine.name: HalvingSearchEngine
+}
+
+def get_search_engine(name=None, **kwargs):
+    """Instantiate a registered search engine by name"""
+    name = name or Config.SEARCH_ENGINE
+    if name not in SEARCH_ENGINES:
+        raise ValueError(f"Unknown search engine '{name}', expected one of {sorted(SEARCH_ENGINES)}")
+    return SEARCH_ENGINES[name](**kwargs)
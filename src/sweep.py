@@ -0,0 +1,38 @@
+import numpy as np
+from config.config import Config
+from src.validation import validator
+
+class SweepError(ValueError):
+    """Invalid sweep request; the message is safe to return to the caller"""
+
+def sweep_grid(base, features, points=None):
+    """(axes, rows) varying one or two features across their validation range, the first one slowest"""
+    points = Config.SWEEP_DEFAULT_POINTS if points is None else points
+    if not 1 <= len(features) <= 2:
+        raise SweepError("Vary one or two features")
+    if len(set(features)) != len(features):
+        raise SweepError("Varied features must be different")
+    unknown = [feature for feature in features if feature not in validator.features]
+    if unknown:
+        raise SweepError(f"Unknown features: {', '.join(unknown)}")
+    unbounded = [feature for feature in features if not np.isfinite(validator.bounds(feature)).all()]
+    if unbounded:
+        raise SweepError(f"No validation range for: {', '.join(unbounded)}")
+    if not 2 <= points <= Config.SWEEP_MAX_POINTS:
+        raise SweepError(f"Points must be between 2 and {Config.SWEEP_MAX_POINTS}")
+
+    base = np.asarray(base, dtype=np.float64)
+    # The varied features are overwritten, so only the fixed ones need to be in range
+    invalid = [
+        feature for feature in validator.invalid_features(base.tolist())
+        if feature not in features
+    ]
+    if invalid:
+        raise SweepError(f"Invalid value for {invalid[0]}")
+
+    axes = [np.linspace(*validator.bounds(feature), points) for feature in features]
+    grids = np.meshgrid(*axes, indexing='ij')
+    X = np.tile(base, (grids[0].size, 1))
+    for feature, grid in zip(features, grids):
+        X[:, validator.features.index(feature)] = grid.ravel()
+    return axes, X
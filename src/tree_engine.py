@@ -0,0 +1,212 @@
+import json
+import os
+import pickle
+import numpy as np
+from config.config import Config
+from utils.logger import setup_logger
+
+logger = setup_logger('tree_engine')
+
+# Objectives whose prediction is the raw margin (base score + sum of leaves)
+SUPPORTED_OBJECTIVES = ('reg:squarederror', 'reg:absoluteerror', 'reg:pseudohubererror')
+
+def export_booster(model, scaler):
+    """Flatten the booster and scaler of a fitted pipeline into flat node arrays"""
+    regressor = model.named_steps['regressor']
+    booster = regressor.get_booster()
+    dump = json.loads(booster.save_raw('json'))
+    learner = dump['learner']
+
+    objective = learner['objective']['name']
+    if objective not in SUPPORTED_OBJECTIVES:
+        raise ValueError(f"Unsupported objective for compiled export: {objective}")
+
+    trees = learner['gradient_booster']['model']['trees']
+    iteration_indptr = learner['gradient_booster']['model']['iteration_indptr']
+    try:
+        n_trees = iteration_indptr[regressor.best_iteration + 1]
+    except AttributeError:
+        n_trees = len(trees)
+    trees = trees[:n_trees]
+
+    feature, threshold, left, right, default_left, value, roots = [], [], [], [], [], [], []
+    max_depth = 0
+    offset = 0
+    for tree in trees:
+        if any(tree['split_type']):
+            raise ValueError("Categorical splits are not supported by the compiled engine")
+
+        tree_left = np.asarray(tree['left_children'], dtype=np.int32)
+        tree_right = np.asarray(tree['right_children'], dtype=np.int32)
+        is_leaf = tree_left == -1
+
+        feature.append(np.where(is_leaf, 0, tree['split_indices']).astype(np.int32))
+        threshold.append(np.asarray(tree['split_conditions'], dtype=np.float32))
+        left.append(np.where(is_leaf, -1, tree_left + offset).astype(np.int32))
+        right.append(np.where(is_leaf, -1, tree_right + offset).astype(np.int32))
+        default_left.append(np.asarray(tree['default_left'], dtype=bool))
+        # Leaf values are stored in split_conditions for leaf nodes
+        value.append(np.where(is_leaf, tree['split_conditions'], 0).astype(np.float32))
+        roots.append(offset)
+
+        # Depth of the tree, walking parents from every leaf
+        parents = tree['parents']
+        for node in np.flatnonzero(is_leaf):
+            depth = 0
+            while node != 0:
+                node = parents[node]
+                depth += 1
+            max_depth = max(max_depth, depth)
+
+        offset += len(tree_left)
+
+    n_features = len(Config.FEATURE_COLUMNS)
+    return {
+        'feature': np.concatenate(feature),
+        'threshold': np.concatenate(threshold),
+        'left': np.concatenate(left),
+        'right': np.concatenate(right),
+        'default_left': np.concatenate(default_left),
+        'value': np.concatenate(value),
+        'roots': np.asarray(roots, dtype=np.int32),
+        'max_depth': np.int32(max_depth),
+        'base_score': np.float32(float(learner['learner_model_param']['base_score'])),
+        'missing': np.float32(regressor.missing),
+        'mean': np.asarray(scaler.mean_, dtype=np.float64) if scaler.with_mean else np.zeros(n_features),
+        'scale': np.asarray(scaler.scale_, dtype=np.float64) if scaler.with_std else np.ones(n_features),
+        'feature_names': np.asarray(Config.FEATURE_COLUMNS)
+    }
+
+def export_compiled_model(model, path=None):
+    """Export the trained pipeline and saved scaler as memory-mappable .npy files"""
+    path = path or Config.COMPILED_MODEL_PATH
+    with open(Config.SCALER_PATH, 'rb') as f:
+        scaler = pickle.load(f)
+
+    arrays = export_booster(model, scaler)
+    os.makedirs(path, exist_ok=True)
+    for name, array in arrays.items():
+        np.save(os.path.join(path, f"{name}.npy"), array)
+    logger.info(f"Compiled model with {len(arrays['roots'])} trees exported to {path}")
+    return CompiledPredictor(arrays)
+
+class CompiledPredictor:
+    """Pure NumPy evaluator for an exported model, with every tree padded to a complete binary tree"""
+
+    BLOCK_SIZE = 2048
+    ARRAYS = ('feature', 'threshold', 'left', 'right', 'default_left', 'value', 'roots',
+              'max_depth', 'base_score', 'missing', 'mean', 'scale', 'feature_names')
+
+    def __init__(self, arrays):
+        self.max_depth = int(arrays['max_depth'])
+        self.base_score = np.float32(arrays['base_score'])
+        self.missing = float(arrays['missing'])
+        self.mean = arrays['mean']
+        self.scale = arrays['scale']
+        self.path = None  # Export directory when loaded from disk
+
+        feature_names = [str(name) for name in arrays['feature_names']]
+        if feature_names != list(Config.FEATURE_COLUMNS):
+            raise ValueError(f"Compiled model features {feature_names} do not match Config.FEATURE_COLUMNS")
+
+        self._build_complete_trees(arrays)
+
+    def _build_complete_trees(self, arrays):
+        # One level at a time over all trees; nodes holds the original node ids of the level
+        left, right = arrays['left'], arrays['right']
+        n_trees = len(arrays['roots'])
+        self.n_internal = 2 ** self.max_depth - 1
+        feature = np.zeros((n_trees, self.n_internal), dtype=np.intp)
+        threshold = np.zeros((n_trees, self.n_internal), dtype=np.float32)
+        default_left = np.ones((n_trees, self.n_internal), dtype=bool)
+
+        nodes = np.asarray(arrays['roots'], dtype=np.intp)[:, None]
+        for depth in range(self.max_depth):
+            level = slice(2 ** depth - 1, 2 ** (depth + 1) - 1)
+            is_leaf = left[nodes] == -1
+            feature[:, level] = np.where(is_leaf, 0, arrays['feature'][nodes])
+            threshold[:, level] = np.where(is_leaf, np.inf, arrays['threshold'][nodes])
+            default_left[:, level] = np.where(is_leaf, True, arrays['default_left'][nodes])
+            children = np.stack([np.where(is_leaf, nodes, left[nodes]), np.where(is_leaf, nodes, right[nodes])], axis=2)
+            nodes = children.reshape(n_trees, -1)
+
+        self.feature = feature.ravel()
+        self.threshold = threshold.ravel()
+        self.default_left = default_left.ravel()
+        self.leaf_value = np.asarray(arrays['value'][nodes], dtype=np.float32)
+        self.tree_offset = np.arange(n_trees, dtype=np.intp) * self.n_internal
+        self.tree_index = np.arange(n_trees, dtype=np.intp)
+
+    @classmethod
+    def load(cls, path=None, mmap=True):
+        """Load a compiled model exported by export_compiled_model, memory-mapped by default"""
+        path = path or Config.COMPILED_MODEL_PATH
+        mmap_mode = 'r' if mmap else None
+        predictor = cls({
+            name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode)
+            for name in cls.ARRAYS
+        })
+        predictor.path = path
+        return predictor
+
+    def _predict_block(self, X32):
+        n_rows, n_features = X32.shape
+        if not np.isnan(self.missing):
+            X32 = np.where(X32 == self.missing, np.float32(np.nan), X32)
+        has_nan = np.isnan(X32).any()
+        flat = X32.ravel()
+        row_offset = (np.arange(n_rows, dtype=np.intp) * n_features)[:, None]
+
+        node = np.zeros((n_rows, len(self.tree_offset)), dtype=np.intp)
+        for _ in range(self.max_depth):
+            slot = node + self.tree_offset
+            x = flat[row_offset + self.feature[slot]]
+            go_right = ~(x < self.threshold[slot])
+            if has_nan:
+                go_right &= ~(np.isnan(x) & self.default_left[slot])
+            node = 2 * node + 1 + go_right
+
+        # Accumulate tree by tree in float32, matching XGBoost's summation order
+        leaves = np.empty((n_rows, len(self.tree_offset) + 1), dtype=np.float32)
+        leaves[:, 0] = self.base_score
+        leaves[:, 1:] = self.leaf_value[self.tree_index, node - self.n_internal]
+        return np.add.accumulate(leaves, axis=1)[:, -1]
+
+    def predict(self, X):
+        """Predict log prices for an (n_rows, n_features) array ordered by Config.FEATURE_COLUMNS"""
+        X = np.array(X, dtype=np.float64).reshape(-1, len(Config.FEATURE_COLUMNS))
+        X -= self.mean
+        X /= self.scale
+        X32 = X.astype(np.float32)
+        return np.concatenate(
+            [self._predict_block(X32[start:start + self.BLOCK_SIZE])
+             for start in range(0, len(X32), self.BLOCK_SIZE)]
+        ) if len(X32) else np.empty(0, dtype=np.float32)
+
+    def predict_row(self, values):
+        """Predict the log price for a single row of feature values"""
+        return self.predict([values])[0]
+
+def check_compiled_parity(compiled, model, tolerance=1e-5, X=None):
+    """Compare compiled predictions against model.predict on X, by default the training dataset"""
+    with open(Config.SCALER_PATH, 'rb') as f:
+        scaler = pickle.load(f)
+    if X is None:
+        from src.dataset import load_dataset
+        X = load_dataset(columns=Config.FEATURE_COLUMNS)
+    # Score in float64 like serving does; the cached dataset is float32
+    X = np.asarray(X, dtype=np.float64).reshape(-1, len(Config.FEATURE_COLUMNS))
+
+    # Named columns only if the scaler was fitted on a DataFrame (in memory), not on shards (out-of-core)
+    X_scaler = X
+    if hasattr(scaler, 'feature_names_in_'):
+        import pandas as pd
+        X_scaler = pd.DataFrame(X, columns=scaler.feature_names_in_)
+    expected = model.predict(scaler.transform(X_scaler))
+    actual = compiled.predict(X)
+    max_diff = float(np.max(np.abs(expected - actual))) if len(X) else 0.0
+    if max_diff > tolerance:
+        raise ValueError(f"Compiled model diverges from pipeline (max abs diff {max_diff:.3e})")
+
+    logger.info(f"Compiled model parity check passed on {len(X)} rows (max abs diff {max_diff:.3e})")
+    return max_diff
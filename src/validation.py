@@ -0,0 +1,45 @@
+import numpy as np
+from config.config import Config
+
+class FeatureValidator:
+    """Config.DATA_VALIDATION compiled into bound arrays aligned with Config.FEATURE_COLUMNS"""
+
+    def __init__(self, features=None, ranges=None):
+        self.features = list(Config.FEATURE_COLUMNS if features is None else features)
+        ranges = Config.DATA_VALIDATION if ranges is None else ranges
+        self.low = np.array([ranges.get(f, {}).get('min', -np.inf) for f in self.features], dtype=np.float64)
+        self.high = np.array([ranges.get(f, {}).get('max', np.inf) for f in self.features], dtype=np.float64)
+        # Plain-float copy for single rows, where NumPy call overhead outweighs the work
+        self._bounds = tuple(zip(self.features, self.low.tolist(), self.high.tolist()))
+
+    def bounds(self, feature):
+        """(min, max) of a feature"""
+        index = self.features.index(feature)
+        return float(self.low[index]), float(self.high[index])
+
+    def violations(self, X):
+        """Boolean (n_rows, n_features) mask, True where a value is out of range or NaN"""
+        X = np.asarray(X, dtype=np.float64).reshape(-1, len(self.features))
+        return ~((X >= self.low) & (X <= self.high))
+
+    def valid_rows(self, X):
+        """True for rows with every feature in range"""
+        return ~self.violations(X).any(axis=1)
+
+    def invalid_features(self, values):
+        """Names of the out-of-range features of one row given in feature order"""
+        return [
+            feature for (feature, low, high), value in zip(self._bounds, values)
+            if not low <= value <= high
+        ]
+
+    def errors(self, violations):
+        """Per-row error entries for the rows of a violation mask that have any violation"""
+        rows, cols = np.nonzero(violations)
+        errors = {}
+        for row, col in zip(rows.tolist(), cols.tolist()):
+            errors.setdefault(row, []).append(f"Invalid value for {self.features[col]}")
+        return [{"index": row, "detail": detail} for row, detail in errors.items()]
+
+# Shared by the API, the Streamlit pages and score.py
+validator = FeatureValidator()
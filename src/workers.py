@@ -0,0 +1,69 @@
+import multiprocessing
+import os
+import numpy as np
+from config.config import Config
+from src.inference import HybridPredictor, load_serving_predictor
+from src.tree_engine import CompiledPredictor
+from utils.logger import setup_logger
+
+logger = setup_logger('workers')
+
+# Compiled engine used inside worker processes. With the fork start method it is
+# set in the parent before the pool starts and shared copy-on-write; spawned
+# workers memory-map the same export and only rebuild its small lookup tables.
+_worker_predictor = None
+
+def _init_worker(compiled_path):
+    global _worker_predictor
+    if _worker_predictor is None:
+        _worker_predictor = CompiledPredictor.load(compiled_path)
+
+def _predict_partition(X):
+    return _worker_predictor.predict(X)
+
+def compiled_engine(predictor):
+    """The memory-mapped compiled engine behind a serving predictor"""
+    if isinstance(predictor, HybridPredictor):
+        return predictor.compiled
+    if isinstance(predictor, CompiledPredictor):
+        return predictor
+    raise ValueError("The scoring pool needs a compiled model export, run train.py first")
+
+class ScoringPool:
+    """Pool of worker processes scoring partitions of a feature array in parallel"""
+
+    def __init__(self, n_workers=None, predictor=None):
+        global _worker_predictor
+        self.n_workers = n_workers or os.cpu_count() or 1
+        compiled = compiled_engine(predictor or load_serving_predictor())
+
+        # Workers only run the NumPy engine, never XGBoost's fork-unsafe OpenMP runtime
+        use_fork = 'fork' in multiprocessing.get_all_start_methods()
+        if use_fork:
+            _worker_predictor = compiled
+        elif compiled.path is None:
+            raise ValueError("Spawned workers need a compiled model loaded from disk")
+        context = multiprocessing.get_context('fork' if use_fork else 'spawn')
+        self._pool = context.Pool(self.n_workers, initializer=_init_worker, initargs=(compiled.path,))
+        logger.info(
+            f"Scoring pool started with {self.n_workers} {context.get_start_method()} workers "
+            f"sharing the compiled model at {compiled.path}"
+        )
+
+    def predict(self, X):
+        """Predict log prices for X, split into one partition per worker, in input order"""
+        X = np.asarray(X, dtype=np.float64).reshape(-1, len(Config.FEATURE_COLUMNS))
+        if not len(X):
+            return np.empty(0, dtype=np.float32)
+        partitions = np.array_split(X, min(self.n_workers, len(X)))
+        return np.concatenate(self._pool.map(_predict_partition, partitions))
+
+    def close(self):
+        self._pool.close()
+        self._pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
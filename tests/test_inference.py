@@ -0,0 +1,72 @@
+import pickle
+import numpy as np
+import pandas as pd
+import pytest
+from config.config import Config
+from src.inference import FastPredictor
+
+pytestmark = pytest.mark.skipif(
+    not (Config.MODEL_PATH.exists() and Config.SCALER_PATH.exists()),
+    reason="needs the trained artifacts, run train.py first"
+)
+
+@pytest.fixture(scope="module")
+def pipeline():
+    with open(Config.MODEL_PATH, 'rb') as f:
+        model = pickle.load(f)
+    with open(Config.SCALER_PATH, 'rb') as f:
+        scaler = pickle.load(f)
+    return model, scaler
+
+@pytest.fixture(scope="module")
+def X():
+    """Dataset rows plus random rows spread over the valid input ranges"""
+    data = pd.read_csv(Config.DATA_PATH)[Config.FEATURE_COLUMNS].to_numpy(dtype=np.float64)
+    rng = np.random.default_rng(Config.RANDOM_STATE)
+    low = np.array([Config.get_feature_range(f)['min'] for f in Config.FEATURE_COLUMNS])
+    high = np.array([Config.get_feature_range(f)['max'] for f in Config.FEATURE_COLUMNS])
+    return np.vstack([data, rng.uniform(low, high, size=(1000, len(Config.FEATURE_COLUMNS)))])
+
+def reference_predict(model, scaler, X):
+    """The original /predict path: DataFrame ordered by Config.FEATURE_COLUMNS, scaler.transform, model.predict"""
+    df = pd.DataFrame(X, columns=Config.FEATURE_COLUMNS)
+    return model.predict(scaler.transform(df[Config.FEATURE_COLUMNS]))
+
+def test_fast_predictor_matches_pipeline(pipeline, X):
+    model, scaler = pipeline
+    predictor = FastPredictor.from_pipeline(model, scaler)
+    expected = reference_predict(model, scaler, X)
+
+    np.testing.assert_array_equal(predictor.predict(X), expected)
+    np.testing.assert_array_equal(np.array([predictor.predict_row(row) for row in X]), expected)
+
+def test_native_predictor_matches_pipeline(pipeline, X):
+    if not Config.NATIVE_MODEL_PATH.exists():
+        pytest.skip("no native model export")
+    from src.artifacts import load_native_predictor
+
+    model, scaler = pipeline
+    predictor = load_native_predictor()
+    expected = reference_predict(model, scaler, X)
+
+    np.testing.assert_array_equal(predictor.predict(X), expected)
+    np.testing.assert_array_equal(np.array([predictor.predict_row(row) for row in X]), expected)
+
+
+def test_hybrid_predictor_matches_pipeline(pipeline, X):
+    if not (Config.COMPILED_MODEL_PATH.exists() and Config.NATIVE_MODEL_PATH.exists()):
+        pytest.skip("no compiled or native model export")
+    from src.inference import HybridPredictor, load_serving_predictor
+
+    model, scaler = pipeline
+    predictor = load_serving_predictor()
+    assert isinstance(predictor, HybridPredictor)
+    expected = reference_predict(model, scaler, X)
+
+    # Small batches stay on the compiled engine, the full set goes to the native booster
+    small = predictor.max_compiled_rows
+    np.testing.assert_array_equal(predictor.predict(X[:small]), expected[:small])
+    assert predictor._native is None
+    np.testing.assert_array_equal(predictor.predict(X), expected)
+    assert predictor._native is not None
+    np.testing.assert_array_equal(np.array([predictor.predict_row(row) for row in X]), expected)
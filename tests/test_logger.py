@@ -0,0 +1,62 @@
+import statistics
+import time
+import pytest
+from config.config import Config
+import utils.logger as logger_module
+
+RERUNS = 1000
+RECORDS_PER_RERUN = 20
+
+# What a Streamlit page does at the top of every rerun
+PAGE_SCRIPT = '''
+logger = setup_logger('page')
+for i in range(n_records):
+    logger.info("rerun %d record %d", rerun, i)
+'''
+
+@pytest.fixture
+def log_file(tmp_path, monkeypatch):
+    """Fresh process-wide logging writing to a temporary file"""
+    logger_module._stop_listener()
+    monkeypatch.setattr(Config, 'LOGS_DIR', tmp_path)
+    monkeypatch.setattr(Config, 'LOG_FILE', tmp_path / "app.log")
+    monkeypatch.setattr(logger_module, '_queue_handler', None)
+    monkeypatch.setattr(logger_module, '_listener', None)
+    monkeypatch.setattr(logger_module, '_handlers', {})
+    yield tmp_path / "app.log"
+    logger_module._stop_listener()
+    logger_module.logging.getLogger('page').handlers.clear()
+
+def test_log_throughput_constant_across_reruns(log_file):
+    code = compile(PAGE_SCRIPT, 'page', 'exec')
+    durations = []
+    for rerun in range(RERUNS):
+        start = time.perf_counter()
+        exec(code, {'setup_logger': logger_module.setup_logger, 'n_records': RECORDS_PER_RERUN, 'rerun': rerun})
+        durations.append(time.perf_counter() - start)
+
+    assert len(logger_module.logging.getLogger('page').handlers) == 1
+    assert len(logger_module._handlers) == 2
+
+    # Per-rerun cost does not grow with the number of reruns
+    first = statistics.median(durations[:100])
+    last = statistics.median(durations[-100:])
+    assert last < 3 * first + 1e-4
+
+    logger_module._stop_listener()
+    with open(log_file) as f:
+        lines = f.readlines()
+    assert len(lines) == RERUNS * RECORDS_PER_RERUN
+
+def test_buffered_records_written_when_idle(log_file, monkeypatch):
+    monkeypatch.setattr(Config, 'LOG_FLUSH_INTERVAL', 0.2)
+    logger = logger_module.setup_logger('page')
+    for i in range(5):
+        logger.info("record %d", i)
+
+    deadline = time.monotonic() + 2.0
+    while time.monotonic() < deadline:
+        if log_file.exists() and len(log_file.read_text().splitlines()) == 5:
+            break
+        time.sleep(0.05)
+    assert len(log_file.read_text().splitlines()) == 5
@@ -0,0 +1,31 @@
+import pytest
+from config.config import Config
+from src.prediction_cache import PredictionCache
+
+EXAMPLE = {"LSTAT": 10.0, "RM": 6.0, "CRIM": 0.1, "PTRATIO": 15.0, "INDUS": 10.0, "TAX": 300.0, "NOX": 0.5, "B": 300.0}
+
+
+def test_nearby_values_get_their_own_entries():
+    cache = PredictionCache(maxsize=10, ttl=60)
+    cache.set(cache.key("v1", [0.400988]), 20.59)
+
+    assert cache.get(cache.key("v1", [0.401001])) is None
+    assert cache.get(cache.key("v1", [0.400988])) == 20.59
+    assert cache.get(cache.key("v2", [0.400988])) is None
+
+
+@pytest.mark.skipif(not Config.COMPILED_MODEL_PATH.exists(), reason="needs the trained artifacts, run train.py first")
+def test_cached_predictions_do_not_depend_on_request_order():
+    from fastapi.testclient import TestClient
+    import app
+
+    # NOX values a few millionths apart fall on both sides of a split of the trained model
+    with TestClient(app.app) as client:
+        app.prediction_cache.clear()
+        for nox in (0.400988, 0.401001):
+            features = {**EXAMPLE, "NOX": nox}
+            single = client.post("/predict", json=features).json()["prediction"]
+            batch = client.post("/predict/batch", json={"records": [features]}).json()["predictions"][0]
+            assert single == batch
+            # Served from the cache the second time, still the same value
+            assert client.post("/predict", json=features).json()["prediction"] == batch
@@ -1,32 +1,200 @@
+import argparse
+import json
+from pathlib import Path
+from config.config import Config
 from src.data_preparation import load_and_prepare_data
 from src.model import create_pipeline, train_model
 from src.evaluation import evaluate_model
+from src.out_of_core import (
+    evaluate_out_of_core, parity_rows, prepare_out_of_core_data, shard_rows, train_out_of_core
+)
+from src.analytics import load_analytics
+from src.artifacts import export_native_model
+from src.cache import FoldCache, TrainingCache, data_cache_key, training_cache_key
+from src.registry import ModelRegistry
+from src.search import SEARCH_ENGINES, get_search_engine
+from src.tree_engine import export_compiled_model, check_compiled_parity
 from utils.logger import setup_logger
+from utils.profiling import StageProfiler, summarize_trials
 
 logger = setup_logger('train')
 
-def main():
+PARAM_GRIDS = {
+    'default': Config.PARAM_GRID,
+    'full': Config.PARAMS
+}
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Train the house price model")
+    parser.add_argument('--engine', choices=sorted(SEARCH_ENGINES), default=Config.SEARCH_ENGINE,
+                        help="Hyperparameter search engine")
+    parser.add_argument('--param-grid', choices=sorted(PARAM_GRIDS), default='default',
+                        help="Parameter grid to search")
+    parser.add_argument('--n-jobs', type=int, default=Config.SEARCH_N_JOBS,
+                        help="Number of parallel trials (-1 for all cores)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Retrain from scratch, ignoring cached runs and fold results")
+    parser.add_argument('--profile', action='store_true',
+                        help="Time each stage and record peak RSS (implies --no-cache)")
+    parser.add_argument('--profile-memory', action='store_true',
+                        help="With --profile, also trace Python allocations per stage (tracemalloc, slows training)")
+    parser.add_argument('--profile-output', default=Config.TRAIN_PROFILE_PATH,
+                        help="Where --profile writes its JSON report")
+    parser.add_argument('--cprofile', default=None, metavar='PATH',
+                        help="With --profile, also write cProfile stats (view with snakeviz or flameprof)")
+    parser.add_argument('--out-of-core', action='store_true',
+                        help="Stream the data in chunks and train through XGBoost external memory (no search)")
+    parser.add_argument('--data', type=Path, default=Config.DATA_PATH,
+                        help="CSV to train on with --out-of-core")
+    parser.add_argument('--chunk-size', type=int, default=Config.OUT_OF_CORE_CHUNK_SIZE,
+                        help="Rows per chunk and shard with --out-of-core")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    Config.create_directories()
+    # Cached runs or fold results would hide the cost being measured
+    use_cache = not (args.no_cache or args.profile)
+    profiler = StageProfiler(
+        enabled=args.profile, cprofile=args.cprofile is not None, trace_memory=args.profile_memory
+    ).start()
     try:
+        with profiler.stage('create_pipeline'):
+            pipeline = create_pipeline()
+        if args.out_of_core:
+            return run_out_of_core(args, pipeline, profiler)
+
+        param_grid = PARAM_GRIDS[args.param_grid]
+        data_key = data_cache_key()
+        fold_cache = FoldCache(data_key) if use_cache else None
+        engine = get_search_engine(args.engine, n_jobs=args.n_jobs, fold_cache=fold_cache)
+        training_cache = TrainingCache()
+        cache_key = training_cache_key(data_key, pipeline, param_grid, engine)
+
+        # Skip training when data, settings and grid are unchanged
+        if use_cache:
+            cached_metrics = training_cache.lookup(cache_key)
+            if cached_metrics is not None:
+                logger.info("Training inputs unchanged, reusing cached artifacts")
+                logger.info(f"Test R2 Score: {cached_metrics['test_r2']:.4f}")
+                logger.info(f"Test RMSE: {cached_metrics['test_rmse']:.4f}")
+                return cached_metrics
+
         # Load dan prepare data
         logger.info("Loading and preparing data...")
-        X_train, X_test, y_train, y_test, feature_names = load_and_prepare_data()
+        with profiler.stage('load_and_prepare_data'):
+            X_train, X_test, y_train, y_test, feature_names = load_and_prepare_data()
 
         # Create dan train model
         logger.info("Creating and training model...")
-        pipeline = create_pipeline()
-        model, feature_importance = train_model(pipeline, X_train, y_train, feature_names)
+        with profiler.stage('train_model'):
+            model, feature_importance = train_model(
+                pipeline, X_train, y_train, feature_names,
+                param_grid=param_grid,
+                engine=engine
+            )
+        if fold_cache is not None:
+            logger.info(f"Fold cache: {fold_cache.hits} hits, {fold_cache.misses} misses")
 
         # Evaluasi model
         logger.info("Evaluating model...")
-        metrics, _ = evaluate_model(model, X_train, X_test, y_train, y_test, feature_names)
+        with profiler.stage('evaluate_model'):
+            metrics, _ = evaluate_model(model, X_train, X_test, y_train, y_test, feature_names)
+
+        # Export compiled and native (pickle-free) models for serving
+        logger.info("Exporting compiled model...")
+        with profiler.stage('export'):
+            compiled = export_compiled_model(model)
+            check_compiled_parity(compiled, model)
+            export_native_model(model)
+
+        # Precompute the Analytics page aggregates for this dataset
+        with profiler.stage('analytics'):
+            load_analytics()
         
         logger.info("Training completed successfully")
         logger.info(f"Test R2 Score: {metrics['test_r2']:.4f}")
         logger.info(f"Test RMSE: {metrics['test_rmse']:.4f}")
+
+        training_cache.store(cache_key, metrics)
+
+        # Publish to the model registry, picked up by running APIs
+        with profiler.stage('publish'):
+            version = ModelRegistry().publish()
+        logger.info(f"Model version: {version}")
+
+        if args.profile:
+            write_profile(profiler, args, len(X_train), search=True)
+        return metrics
+        
+    except Exception as e:
+        logger.error(f"Error in training pipeline: {str(e)}")
+        raise
+
+def run_out_of_core(args, pipeline, profiler):
+    """Train on a file larger than memory: chunked split and scaler, external-memory XGBoost"""
+    try:
+        logger.info(f"Preparing {args.data} out-of-core...")
+        with profiler.stage('prepare_out_of_core_data'):
+            train_shards, test_shards, scaler = prepare_out_of_core_data(args.data, args.chunk_size)
+
+        logger.info("Training model out-of-core...")
+        with profiler.stage('train_model'):
+            model = train_out_of_core(train_shards, scaler, pipeline)
+
+        logger.info("Evaluating model...")
+        with profiler.stage('evaluate_model'):
+            metrics, _ = evaluate_out_of_core(model, train_shards, test_shards, scaler, Config.FEATURE_COLUMNS)
+
+        logger.info("Exporting compiled model...")
+        with profiler.stage('export'):
+            compiled = export_compiled_model(model)
+            check_compiled_parity(compiled, model, X=parity_rows(test_shards or train_shards))
+            export_native_model(model)
+
+        logger.info("Training completed successfully")
+        logger.info(f"Test R2 Score: {metrics.get('test_r2', float('nan')):.4f}")
+        logger.info(f"Test RMSE: {metrics.get('test_rmse', float('nan')):.4f}")
+
+        with profiler.stage('publish'):
+            version = ModelRegistry().publish()
+        logger.info(f"Model version: {version}")
+
+        if args.profile:
+            write_profile(profiler, args, shard_rows(train_shards))
+        return metrics
         
     except Exception as e:
         logger.error(f"Error in training pipeline: {str(e)}")
         raise
 
+def write_profile(profiler, args, n_train_rows, search=False):
+    """Write the --profile report, with per-candidate fit times from the search results"""
+    profiler.stop()
+    report = profiler.report(out_of_core=args.out_of_core, n_jobs=args.n_jobs, train_rows=n_train_rows)
+    if search:
+        with open(Config.SEARCH_RESULTS_PATH) as f:
+            results = json.load(f)
+        # train_model = search + refit of the best candidate on the full training set
+        profiler.stages['train_model']['search_seconds'] = results['wall_time']
+        report.update(
+            engine=results['engine'],
+            param_grid=args.param_grid,
+            search=summarize_trials(results['trials'])
+        )
+    if args.cprofile:
+        profiler.dump_cprofile(args.cprofile)
+        report['cprofile_path'] = str(args.cprofile)
+        report['cprofile_top'] = profiler.top_functions()
+
+    with open(args.profile_output, 'w') as f:
+        json.dump(report, f, indent=4)
+    for name, stage in profiler.stages.items():
+        memory = [f"peak RSS {stage['max_rss_mb']:.0f} MB"] if stage['max_rss_mb'] is not None else []
+        if 'peak_traced_mb' in stage:
+            memory.append(f"peak {stage['peak_traced_mb']:.1f} MB traced")
+        logger.info(", ".join([f"{name}: {stage['seconds']:.2f}s"] + memory))
+    logger.info(f"Profile written to {args.profile_output}")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,28 +1,171 @@
+import atexit
+import json
 import logging
+import multiprocessing.util
 import os
-from datetime import datetime
-from pathlib import Path
+import queue
+import random
+import threading
+import time
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener, WatchedFileHandler
+from config.config import Config
+
+# Attributes every LogRecord has, plus the sampling flag; anything else was passed through `extra`
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'sample'}
+
+# Process-wide logging state, created once by configure_logging
+_config_lock = threading.Lock()
+_handlers = {}
+_queue_handler = None
+_listener = None
+
+class DeferredQueueHandler(QueueHandler):
+    """Queue handler that leaves message formatting to the listener thread"""
+
+    def prepare(self, record):
+        return record
+
+class SamplingFilter(logging.Filter):
+    """Keep only a fraction of records logged with extra={'sample': True}"""
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        if getattr(record, 'sample', False) and record.levelno <= logging.INFO:
+            return random.random() < self.rate
+        return True
+
+class BatchingHandler(MemoryHandler):
+    """Buffer records and flush them to the target in batches"""
+
+    def __init__(self, capacity, target, flush_interval):
+        super().__init__(capacity, flushLevel=logging.ERROR, target=target)
+        self.flush_interval = flush_interval
+        self._last_flush = time.monotonic()
+
+    def shouldFlush(self, record):
+        return (
+            super().shouldFlush(record)
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        )
+
+    def flush(self):
+        super().flush()
+        self._last_flush = time.monotonic()
+
+class FlushingQueueListener(QueueListener):
+    """Queue listener that flushes its handlers after flush_interval seconds without records"""
+
+    def __init__(self, queue, *handlers, flush_interval, respect_handler_level=False):
+        super().__init__(queue, *handlers, respect_handler_level=respect_handler_level)
+        self.flush_interval = flush_interval
+
+    def dequeue(self, block):
+        while True:
+            try:
+                return self.queue.get(block=block, timeout=self.flush_interval if block else None)
+            except queue.Empty:
+                if not block:
+                    raise
+                for handler in self.handlers:
+                    handler.flush()
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, including fields passed through `extra`"""
+
+    def format(self, record):
+        payload = {
+            'time': self.formatTime(record),
+            'name': record.name,
+            'level': record.levelname,
+            'message': record.getMessage()
+        }
+        payload.update({k: v for k, v in vars(record).items() if k not in _RECORD_ATTRS})
+        if record.exc_info:
+            payload['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+def configure_logging():
+    """Configure process-wide logging once; later calls return the shared handler"""
+    global _queue_handler
+    with _config_lock:
+        if _queue_handler is not None:
+            return _queue_handler
+
+        Config.LOGS_DIR.mkdir(parents=True, exist_ok=True)
+        formatter = logging.Formatter(Config.LOG_FORMAT)
+
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+        file_handler = WatchedFileHandler(Config.LOG_FILE)
+        file_handler.setFormatter(JsonFormatter() if Config.LOG_JSON else formatter)
+
+        # Handlers run on the listener thread; callers only enqueue records
+        _handlers.update({
+            'console': console_handler,
+            'file': BatchingHandler(Config.LOG_BATCH_SIZE, file_handler, Config.LOG_FLUSH_INTERVAL)
+        })
+        _queue_handler = DeferredQueueHandler(queue.SimpleQueue())
+        _queue_handler.addFilter(SamplingFilter(Config.LOG_SAMPLE_RATE))
+        _start_listener()
+        _stop_listener_at_process_exit()
+        multiprocessing.util.register_after_fork(_queue_handler, _stop_listener_at_process_exit)
+        return _queue_handler
+
+def _start_listener():
+    global _listener
+    _listener = FlushingQueueListener(
+        _queue_handler.queue, *_handlers.values(),
+        flush_interval=Config.LOG_FLUSH_INTERVAL,
+        respect_handler_level=True
+    )
+    _listener.start()
+
+def _stop_listener():
+    # Drains the queue and joins the listener thread
+    if _listener is not None and _listener._thread is not None:
+        _listener.stop()
+        for handler in _handlers.values():
+            try:
+                handler.flush()
+            except (OSError, ValueError):
+                # The stream may already be closed at shutdown, as logging.shutdown allows
+                pass
+
+def _restart_listener_in_parent():
+    if _queue_handler is not None:
+        _start_listener()
+
+def _restart_listener_in_child():
+    # Records still queued belong to the parent; give the child its own queue
+    if _queue_handler is not None:
+        _queue_handler.queue = queue.SimpleQueue()
+        _start_listener()
+
+def _stop_listener_at_process_exit(*_):
+    # multiprocessing children leave through os._exit, which skips atexit but runs these finalizers.
+    # Children clear the finalizers inherited from their parent, so this is registered again after fork.
+    multiprocessing.util.Finalize(None, _stop_listener, exitpriority=0)
+
+atexit.register(_stop_listener)
+if hasattr(os, 'register_at_fork'):
+    # A fork while the listener is writing would leave the child with locked
+    # file objects, so the listener is stopped around fork and restarted on both sides
+    os.register_at_fork(
+        before=_stop_listener,
+        after_in_parent=_restart_listener_in_parent,
+        after_in_child=_restart_listener_in_child
+    )
 
 def setup_logger(name):
-    """Setup logger with file and console handlers"""
-    # Create logs directory if it doesn't exist
-    log_dir = Path('logs')
-    log_dir.mkdir(exist_ok=True)
-    
+    """Return the named logger attached to the shared logging configuration"""
+    queue_handler = configure_logging()
+
     logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
-    
-    # Create handlers
-    c_handler = logging.StreamHandler()
-    f_handler = logging.FileHandler(log_dir / f'{name}_{datetime.now():%Y%m%d}.log')
-    
-    # Create formatters
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    c_handler.setFormatter(formatter)
-    f_handler.setFormatter(formatter)
-    
-    # Add handlers to logger
-    logger.addHandler(c_handler)
-    logger.addHandler(f_handler)
-    
-    return logger
\ No newline at end of file
+    logger.setLevel(Config.LOG_LEVEL)
+    logger.propagate = False
+    if queue_handler not in logger.handlers:
+        logger.addHandler(queue_handler)
+    return logger
@@ -0,0 +1,128 @@
+"""Stage timings and peak memory for the training pipeline (train.py --profile)."""
+import cProfile
+import io
+import platform
+import pstats
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+def _max_rss_mb(who):
+    """Peak resident set size in MB; ru_maxrss is in KB on Linux and bytes on macOS"""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(who).ru_maxrss
+    return max_rss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+class StageProfiler:
+    """Time named stages and record peak RSS, plus traced allocations when trace_memory is set"""
+
+    def __init__(self, enabled=True, cprofile=False, trace_memory=False):
+        self.enabled = enabled
+        # tracemalloc hooks every allocation and slows XGBoost/sklearn heavily, so it is opt-in
+        self.trace_memory = enabled and trace_memory
+        self.stages = {}
+        self.total_time = None
+        self.peak_traced = None
+        self._profiler = cProfile.Profile() if enabled and cprofile else None
+        self._start = None
+
+    def start(self):
+        if not self.enabled:
+            return self
+        if self.trace_memory:
+            tracemalloc.start()
+        self._start = time.perf_counter()
+        if self._profiler is not None:
+            self._profiler.enable()
+        return self
+
+    def stop(self):
+        if not self.enabled or self._start is None:
+            return
+        if self._profiler is not None:
+            self._profiler.disable()
+        self.total_time = time.perf_counter() - self._start
+        if self.trace_memory:
+            # stage() resets the tracemalloc peak, so the overall peak is the max over stages
+            _, peak = tracemalloc.get_traced_memory()
+            self.peak_traced = max([peak] + [stage['peak_traced_mb'] * 2 ** 20 for stage in self.stages.values()])
+            tracemalloc.stop()
+        self._start = None
+
+    @contextmanager
+    def stage(self, name):
+        if not self.enabled:
+            yield
+            return
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            start_current, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            # Peak RSS is a high-water mark, so a stage that raised it shows a jump over the previous stage
+            self.stages[name] = {
+                'seconds': time.perf_counter() - start,
+                'max_rss_mb': _max_rss_mb(resource.RUSAGE_SELF) if resource else None
+            }
+            if self.trace_memory:
+                current, peak = tracemalloc.get_traced_memory()
+                self.stages[name]['peak_traced_mb'] = peak / 2 ** 20
+                self.stages[name]['retained_traced_mb'] = (current - start_current) / 2 ** 20
+
+    def dump_cprofile(self, path):
+        """Write cProfile stats, viewable with snakeviz or flameprof"""
+        if self._profiler is not None:
+            self._profiler.dump_stats(path)
+
+    def top_functions(self, limit=25):
+        """Cumulative-time summary of the cProfile run as text"""
+        if self._profiler is None:
+            return None
+        stream = io.StringIO()
+        pstats.Stats(self._profiler, stream=stream).sort_stats('cumulative').print_stats(limit)
+        return stream.getvalue()
+
+    def report(self, **extra):
+        report = {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'total_seconds': self.total_time,
+            'peak_traced_mb': self.peak_traced / 2 ** 20 if self.peak_traced is not None else None,
+            'max_rss_mb': _max_rss_mb(resource.RUSAGE_SELF) if resource else None,
+            'children_max_rss_mb': _max_rss_mb(resource.RUSAGE_CHILDREN) if resource else None,
+            'stages': self.stages
+        }
+        report.update(extra)
+        return report
+
+def summarize_trials(trials, top=10):
+    """Fit-time totals per search budget and the slowest candidates; cached folds count as zero"""
+    by_budget = {}
+    for trial in trials:
+        budget = by_budget.setdefault(str(trial['budget']), {'candidates': 0, 'fit_seconds': 0.0})
+        budget['candidates'] += 1
+        budget['fit_seconds'] += trial['fit_time']
+
+    fit_times = [trial['fit_time'] for trial in trials]
+    slowest = sorted(trials, key=lambda trial: trial['fit_time'], reverse=True)[:top]
+    return {
+        'candidates': len(trials),
+        'fit_seconds_total': sum(fit_times),
+        'fit_seconds_mean': sum(fit_times) / len(fit_times) if fit_times else 0.0,
+        'fit_seconds_max': max(fit_times, default=0.0),
+        'by_budget': by_budget,
+        'slowest': [
+            {key: trial[key] for key in ('params', 'budget', 'n_estimators', 'fit_time', 'mean_score')}
+            for trial in slowest
+        ]
+    }
@@ -0,0 +1,66 @@
+"""Startup profile: import-time breakdown of a module, grouped by package"""
+import argparse
+import json
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+# Packages that should stay out of the serving startup path
+HEAVY_PACKAGES = ('pandas', 'sklearn', 'xgboost', 'scipy', 'matplotlib', 'plotly', 'streamlit')
+
+def profile_imports(module):
+    """Import module in a fresh interpreter with -X importtime and parse the report"""
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True,
+        text=True
+    )
+    wall_time = time.perf_counter() - start
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{completed.stderr[-2000:]}")
+
+    self_time = defaultdict(int)
+    imported = []
+    for line in completed.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, _, _, name = match.groups()
+            self_time[name.split('.')[0]] += int(self_us)
+            imported.append(name)
+
+    return {
+        'module': module,
+        'wall_time': wall_time,
+        'import_time': sum(self_time.values()) / 1e6,
+        'packages': {
+            name: us / 1e6
+            for name, us in sorted(self_time.items(), key=lambda item: item[1], reverse=True)
+        },
+        'heavy_packages': sorted({name.split('.')[0] for name in imported} & set(HEAVY_PACKAGES))
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report import time of a module by package")
+    parser.add_argument('module', nargs='?', default='app')
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--output', default=None, help="Write the full report as JSON")
+    args = parser.parse_args(argv)
+
+    report = profile_imports(args.module)
+    print(f"{args.module}: {report['wall_time']:.3f}s wall, {report['import_time']:.3f}s in imports")
+    for name, seconds in list(report['packages'].items())[:args.top]:
+        print(f"  {name:<30} {seconds * 1000:>9.1f} ms")
+    if report['heavy_packages']:
+        print(f"Heavy packages imported: {', '.join(report['heavy_packages'])}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=4)
+
+if __name__ == "__main__":
+    main()